@@ -0,0 +1,920 @@
+import heapq
+import random
+
+from engine import (
+    COMPARE, SWAP, WRITE, DELETE, MARK, HIGHLIGHT, CLEAR, WAIT, ALLOC, FREE, READ, FLUSH, RUN, CHECK,
+    RED, GREEN, BLUE
+)
+
+# every algorithm is a generator that takes the list and yields operations,
+# the driver applies them to the list before resuming the generator, the
+# yield of a CHECK evaluates to whether the list is sorted
+
+
+def shuffle(lst):
+    # fisher-yates shuffle expressed as swaps
+    for i in range(len(lst) - 1, 0, -1):
+        yield SWAP, i, random.randint(0, i)
+
+
+def write_all(lst, values, start=0):
+    # values is a temporary copy, e.g. from sorted()
+    yield ALLOC, len(values)
+    for k, val in enumerate(values, start):
+        yield WRITE, k, val
+    yield FREE, len(values)
+
+
+def bubble_sort(lst):
+    for i in range(len(lst) - 1):
+        for j in range(len(lst) - 1 - i):
+            # highlight the elements being compared
+            yield COMPARE, j, j + 1
+
+            if lst[j] > lst[j + 1]:
+                yield SWAP, j, j + 1
+
+
+def insertion_sort(lst):
+    for i in range(1, len(lst)):
+        current = lst[i]
+        j = i
+
+        # highlight the current element
+        yield CLEAR,
+        yield HIGHLIGHT, i, GREEN
+
+        while j > 0:
+            # highlight the elements being compared
+            yield COMPARE, j - 1, j
+            if lst[j - 1] <= current:
+                break
+
+            yield WRITE, j, lst[j - 1]
+            j -= 1
+
+        yield WRITE, j, current
+        # highlight the final position
+        yield CLEAR,
+        yield HIGHLIGHT, j, GREEN
+
+
+def stalin_sort(lst):
+    i = 1
+    while i < len(lst):
+        # highlight the elements being compared
+        yield COMPARE, i, i - 1
+
+        if lst[i] < lst[i - 1]:
+            yield DELETE, i
+        else:
+            i += 1
+
+        yield WAIT, 4
+
+
+def bogo_sort(lst):
+    attempts = 0
+    while not (yield CHECK,) and attempts < 100:  # limit attempts to prevent infinite loops
+        # color two random elements to show activity
+        if len(lst) > 1:
+            i, j = random.sample(range(len(lst)), 2)
+            yield CLEAR,
+            yield HIGHLIGHT, i, RED
+            yield HIGHLIGHT, j, GREEN
+
+        yield from shuffle(lst)
+        attempts += 1
+        yield WAIT, 10
+
+
+def median_of_three(lst, lo, hi):
+    # orders lst[lo], lst[mid] and lst[hi] and parks the median at hi - 1
+    mid = (lo + hi) // 2
+    for a, b in ((lo, mid), (mid, hi), (lo, mid)):
+        yield COMPARE, a, b
+        if lst[b] < lst[a]:
+            yield SWAP, a, b
+    yield SWAP, mid, hi - 1
+
+
+def quartile_pivot(lst, lo, hi):
+    # orders three samples at the quartiles of lst[lo:hi + 1] and parks the
+    # median at lo. the ends are left out since three-way partitioning piles
+    # the smallest and largest values of a sorted range up there
+    quarter = (hi - lo) // 4
+    a, mid, b = lo + quarter, (lo + hi) // 2, hi - quarter
+    for x, y in ((a, mid), (mid, b), (a, mid)):
+        yield COMPARE, x, y
+        if lst[y] < lst[x]:
+            yield SWAP, x, y
+    yield SWAP, lo, mid
+
+
+def quick_sort(lst):
+    # three-way quicksort on an explicit stack, the smaller side is sorted
+    # first so the stack stays logarithmic even on sorted or equal input
+    stack = [(0, len(lst) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if start >= end:
+            continue
+
+        # median-of-three pivot moved to the front
+        if end - start >= 2:
+            yield from quartile_pivot(lst, start, end)
+
+        # highlight the pivot
+        yield CLEAR,
+        yield HIGHLIGHT, start, BLUE
+
+        # lst[start:lt] < pivot, lst[lt:i] == pivot, lst[gt + 1:end + 1] > pivot
+        pivot = lst[start]
+        lt, i, gt = start, start + 1, end
+        while i <= gt:
+            # highlight the elements being compared, lst[lt] is always a pivot
+            yield COMPARE, i, lt
+            yield HIGHLIGHT, gt, GREEN
+
+            if lst[i] < pivot:
+                yield SWAP, lt, i
+                lt += 1
+                i += 1
+            elif lst[i] > pivot:
+                yield SWAP, i, gt
+                gt -= 1
+            else:
+                i += 1
+
+        # highlight the final pivot positions
+        yield CLEAR,
+        yield HIGHLIGHT, lt, GREEN
+        yield HIGHLIGHT, gt, RED
+
+        # the larger side goes on the stack first
+        if lt - start < end - gt:
+            stack.append((gt + 1, end))
+            stack.append((start, lt - 1))
+        else:
+            stack.append((start, lt - 1))
+            stack.append((gt + 1, end))
+
+
+def merge_sort(lst):
+    # bottom-up merge sort, runs of width 1, 2, 4, ... are merged through
+    # one auxiliary buffer allocated up front
+    n = len(lst)
+    aux = [0] * n
+    yield ALLOC, n
+
+    width = 1
+    while width < n:
+        for left in range(0, n - width, 2 * width):
+            mid = left + width
+            right = min(left + 2 * width, n)
+
+            # highlight the merging range
+            yield MARK, left, right - 1
+            yield WAIT, 1
+
+            # runs that are already in order need no merge
+            yield COMPARE, mid - 1, mid
+            if lst[mid - 1] <= lst[mid]:
+                continue
+
+            aux[left:right] = lst[left:right]
+            i, j = left, mid
+            for k in range(left, right):
+                if i < mid and j < right:
+                    # highlight the elements being compared
+                    yield COMPARE, i, j
+                    take_left = aux[i] <= aux[j]
+                else:
+                    # highlight the current element
+                    take_left = i < mid
+                    yield HIGHLIGHT, i if take_left else j, GREEN
+
+                if take_left:
+                    yield WRITE, k, aux[i]
+                    i += 1
+                else:
+                    yield WRITE, k, aux[j]
+                    j += 1
+        width *= 2
+
+    yield FREE, n
+
+
+def external_merge_sort(lst, runs=16, fan_in=4):
+    # merge sort of a file too big for memory, played out on the list: the
+    # list stands for the file, memory holds one run, which is sorted and
+    # written back, then fan_in runs at a time are merged through a heap
+    # with one buffer per run and one for the output until one run is left
+    n = len(lst)
+    memory = max(2, -(-n // runs))
+    block = max(1, memory // (fan_in + 1))
+    yield ALLOC, memory
+
+    # run generation, a memory load at a time
+    bounds = []
+    for lo in range(0, n, memory):
+        hi = min(lo + memory, n)
+        yield CLEAR,
+        yield MARK, lo, hi - 1
+        yield READ, hi - lo
+        for k, val in enumerate(sorted(lst[lo:hi]), lo):
+            yield WRITE, k, val
+        yield FLUSH, hi - lo
+        yield RUN, 0
+        bounds.append((lo, hi))
+
+    merge_pass = 0
+    while len(bounds) > 1:
+        merge_pass += 1
+        merged = []
+        for g in range(0, len(bounds), fan_in):
+            group = bounds[g:g + fan_in]
+            lo, hi = group[0][0], group[-1][1]
+            merged.append((lo, hi))
+            if len(group) == 1:
+                continue
+
+            # the merge reads from a copy of the runs and writes over them,
+            # heads[r] is the next element of run r and filled[r] the end of
+            # what its buffer holds
+            runs_copy = lst[lo:hi]
+            heads = [start for start, _ in group]
+            filled = heads.copy()
+            heap = []
+            for r, (start, end) in enumerate(group):
+                filled[r] = min(start + block, end)
+                yield READ, filled[r] - start
+                heap.append((runs_copy[start - lo], r))
+            heapq.heapify(heap)
+
+            pending = 0
+            for k in range(lo, hi):
+                val, r = heapq.heappop(heap)
+                if heap:
+                    # the winner against the runner-up of the frontier
+                    yield COMPARE, heads[r], heads[heap[0][1]]
+                yield MARK, lo, hi - 1
+                for other in range(len(group)):
+                    if other != r and heads[other] < group[other][1]:
+                        yield HIGHLIGHT, heads[other], BLUE
+
+                yield WRITE, k, val
+                pending += 1
+                if pending == block:
+                    yield FLUSH, pending
+                    pending = 0
+
+                heads[r] += 1
+                end = group[r][1]
+                if heads[r] < end:
+                    if heads[r] == filled[r]:
+                        filled[r] = min(filled[r] + block, end)
+                        yield READ, filled[r] - heads[r]
+                    heapq.heappush(heap, (runs_copy[heads[r] - lo], r))
+
+            if pending:
+                yield FLUSH, pending
+            yield RUN, merge_pass
+        bounds = merged
+
+    yield FREE, memory
+
+
+def miracle_sort(lst):
+    # wait for a miracle to happen and the list to sort itself
+    attempts = 0
+    while not (yield CHECK,) and attempts < 50:
+        # highlight random elements to show activity
+        if len(lst) > 2:
+            positions = random.sample(range(len(lst)), min(3, len(lst)))
+            yield CLEAR,
+            for pos in positions:
+                yield HIGHLIGHT, pos, GREEN if random.random() > 0.5 else RED
+
+        # waiting for the miracle
+        yield WAIT, 20
+        attempts += 1
+
+        # simulate small chances of the miracle happening
+        if random.random() < 0.01:
+            yield from write_all(lst, sorted(lst))
+
+
+def selection_sort(lst):
+    for i in range(len(lst)):
+        min_idx = i
+        # highlight current position
+        yield CLEAR,
+        yield HIGHLIGHT, i, BLUE
+
+        for j in range(i + 1, len(lst)):
+            # highlight the elements being compared
+            yield COMPARE, j, min_idx
+            yield HIGHLIGHT, i, BLUE
+
+            if lst[j] < lst[min_idx]:
+                min_idx = j
+
+        # highlight the swap
+        yield CLEAR,
+        yield HIGHLIGHT, i, RED
+        yield HIGHLIGHT, min_idx, GREEN
+        yield SWAP, i, min_idx
+
+
+def sleep_sort(lst):
+    # sort elements by letting them sleep proportionally to their value, a
+    # min-heap of wake-up times decides who wakes next so every element is
+    # placed in O(log n) and the sleeps in between are single waits
+    if not lst:
+        return
+    sleepers = [(val, idx) for idx, val in enumerate(lst)]
+    heapq.heapify(sleepers)
+    yield ALLOC, len(sleepers)
+
+    # steps slept per unit of value - smaller for demonstration
+    scale = 5
+
+    # every element falls asleep, the marked range is the slots still
+    # waiting for a sleeper to wake up
+    n = len(sleepers)
+    yield MARK, 0, n - 1
+
+    # wake up whoever's time has come, one unit of value after another
+    now = sleepers[0][0] - 1
+    placed = 0
+    while sleepers:
+        val, _ = heapq.heappop(sleepers)
+        if val > now:
+            yield WAIT, (val - now) * scale
+            now = val
+
+        # the newly placed element
+        yield WRITE, placed, val
+        yield CLEAR,
+        yield HIGHLIGHT, placed, GREEN
+        placed += 1
+        if placed < n:
+            yield MARK, placed, n - 1
+
+    yield FREE, len(lst)
+
+
+def cocktail_sort(lst):
+    n = len(lst)
+    swapped = True
+    start = 0
+    end = n - 1
+
+    while swapped:
+        swapped = False
+
+        # forward pass
+        for i in range(start, end):
+            # highlight the elements being compared
+            yield COMPARE, i, i + 1
+
+            if lst[i] > lst[i + 1]:
+                yield SWAP, i, i + 1
+                swapped = True
+
+        if not swapped:
+            break
+
+        swapped = False
+        end -= 1
+
+        # backward pass
+        for i in range(end - 1, start - 1, -1):
+            # highlight the elements being compared
+            yield COMPARE, i, i + 1
+
+            if lst[i] > lst[i + 1]:
+                yield SWAP, i, i + 1
+                swapped = True
+
+        start += 1
+
+
+def quantum_bogosort(lst):
+    # destroy the universe and create a new one where the list is sorted
+    attempts = 0
+    while not (yield CHECK,) and attempts < 50:
+        # color random elements to show quantum activity
+        if len(lst) > 3:
+            positions = random.sample(range(len(lst)), min(5, len(lst)))
+            yield CLEAR,
+            for pos in positions:
+                yield HIGHLIGHT, pos, RED if random.random() > 0.5 else GREEN
+
+        # simulate universe destruction
+        yield WAIT, 30
+
+        # try to create a new universe with sorted list
+        if random.random() < 0.1:  # 10% chance of success
+            yield from write_all(lst, sorted(lst))
+            break
+
+        # otherwise, try another random universe
+        yield from shuffle(lst)
+        attempts += 1
+
+
+def brutal_sort(lst):
+    # test all possible permutations until finding a sorted one
+    # (actually just simulating for demonstration)
+    # simulate brutal effort
+    attempts = 0
+    while not (yield CHECK,) and attempts < 30:
+        # highlight random elements to show activity
+        if len(lst) > 2:
+            i = random.randint(0, len(lst) - 2)
+            j = random.randint(i + 1, len(lst) - 1)
+            yield CLEAR,
+            yield HIGHLIGHT, i, RED
+            yield HIGHLIGHT, j, GREEN
+
+        # simulate testing a permutation
+        yield WAIT, 10
+
+        # make some random changes to simulate progress
+        if attempts % 3 == 0 and len(lst) > 1:
+            # the more we advance, the smarter changes we make
+            progress = min(1.0, attempts / 20.0)
+
+            if random.random() < progress:
+                # sort a small portion
+                start = random.randint(0, len(lst) - 2)
+                end = min(start + random.randint(2, 5), len(lst))
+                yield from write_all(lst, sorted(lst[start:end]), start)
+            else:
+                # random swap
+                i = random.randint(0, len(lst) - 1)
+                j = random.randint(0, len(lst) - 1)
+                yield SWAP, i, j
+
+        attempts += 1
+
+        # eventually give up and sort everything
+        if attempts >= 50:
+            yield from write_all(lst, sorted(lst))
+
+
+def sift_down(lst, lo, root, n):
+    # restore the max-heap below root, the heap lives in lst[lo:lo + n]
+    while True:
+        child = 2 * root + 1
+        if child >= n:
+            return
+        if child + 1 < n:
+            yield COMPARE, lo + child, lo + child + 1
+            if lst[lo + child] < lst[lo + child + 1]:
+                child += 1
+
+        yield COMPARE, lo + root, lo + child
+        if lst[lo + root] >= lst[lo + child]:
+            return
+        yield SWAP, lo + root, lo + child
+        root = child
+
+
+def heap_sort_range(lst, lo, hi):
+    # heapsort of lst[lo:hi + 1], also the fallback of introsort
+    n = hi - lo + 1
+    yield MARK, lo, hi
+    for root in range(n // 2 - 1, -1, -1):
+        yield from sift_down(lst, lo, root, n)
+
+    for end in range(n - 1, 0, -1):
+        # move the largest element behind the shrinking heap
+        yield CLEAR,
+        yield HIGHLIGHT, lo + end, GREEN
+        yield SWAP, lo, lo + end
+        yield MARK, lo, lo + end - 1
+        yield from sift_down(lst, lo, 0, end)
+    yield CLEAR,
+
+
+def heap_sort(lst):
+    yield from heap_sort_range(lst, 0, len(lst) - 1)
+
+
+def shell_sort(lst):
+    # gapped insertion sort with the ciura gaps, extended by 2.25 for long lists
+    n = len(lst)
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701]
+    while gaps[-1] * 2.25 < n:
+        gaps.append(int(gaps[-1] * 2.25))
+
+    for gap in reversed(gaps):
+        if gap >= n:
+            continue
+        for i in range(gap, n):
+            current = lst[i]
+            j = i
+
+            # highlight the current element
+            yield CLEAR,
+            yield HIGHLIGHT, i, GREEN
+
+            while j >= gap:
+                yield COMPARE, j - gap, j
+                if lst[j - gap] <= current:
+                    break
+                yield WRITE, j, lst[j - gap]
+                j -= gap
+
+            if j != i:
+                yield WRITE, j, current
+
+
+def intro_sort(lst):
+    # quicksort with a median-of-three pivot that falls back to heapsort
+    # when it goes too deep, ranges of 16 or less are left for one final
+    # insertion sort pass
+    cutoff = 16
+    stack = [(0, len(lst) - 1, 2 * max(1, len(lst)).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo < cutoff:
+            continue
+        if depth == 0:
+            yield from heap_sort_range(lst, lo, hi)
+            continue
+
+        yield CLEAR,
+        yield MARK, lo, hi
+        yield from median_of_three(lst, lo, hi)
+        pivot = lst[hi - 1]
+        yield HIGHLIGHT, hi - 1, BLUE
+
+        # lst[lo] <= pivot <= lst[hi] act as sentinels
+        i, j = lo, hi - 1
+        while True:
+            i += 1
+            yield COMPARE, i, hi - 1
+            while lst[i] < pivot:
+                i += 1
+                yield COMPARE, i, hi - 1
+            j -= 1
+            yield COMPARE, j, hi - 1
+            while pivot < lst[j]:
+                j -= 1
+                yield COMPARE, j, hi - 1
+            if i >= j:
+                break
+            yield SWAP, i, j
+
+        yield SWAP, i, hi - 1
+        stack.append((lo, i - 1, depth - 1))
+        stack.append((i + 1, hi, depth - 1))
+
+    yield from insertion_sort(lst)
+
+
+def radix_sort(lst):
+    # lsd radix sort, one stable counting pass per byte of the values
+    if not lst:
+        return
+    low = min(lst)
+    passes = max(1, ((max(lst) - low).bit_length() + 7) // 8)
+    yield ALLOC, 256
+
+    for shift in range(0, 8 * passes, 8):
+        counts = [0] * 256
+        for val in lst:
+            counts[(val - low) >> shift & 255] += 1
+
+        starts = [0] * 256
+        for digit in range(1, 256):
+            starts[digit] = starts[digit - 1] + counts[digit - 1]
+
+        output = [0] * len(lst)
+        for val in lst:
+            digit = (val - low) >> shift & 255
+            output[starts[digit]] = val
+            starts[digit] += 1
+
+        yield CLEAR,
+        yield from write_all(lst, output)
+
+    yield FREE, 256
+
+
+def counting_sort(lst):
+    # counts every value of the small min..max range and writes them back in order
+    if not lst:
+        return
+    low = min(lst)
+    counts = [0] * (max(lst) - low + 1)
+    yield ALLOC, len(counts)
+
+    for val in lst:
+        counts[val - low] += 1
+
+    k = 0
+    for offset, count in enumerate(counts):
+        for _ in range(count):
+            yield WRITE, k, low + offset
+            k += 1
+
+    yield FREE, len(counts)
+
+
+# galloping starts once one run wins this many times in a row
+MIN_GALLOP = 7
+
+
+def gallop_left(key, key_index, a, start, n, hint, origin):
+    # number of elements of a[start:start + n] smaller than key, searching
+    # outward from hint, origin is the list index a[start] is shown at
+    last, ofs = 0, 1
+    yield COMPARE, key_index, origin + hint
+    if a[start + hint] < key:
+        limit = n - hint
+        while ofs < limit:
+            yield COMPARE, key_index, origin + hint + ofs
+            if not a[start + hint + ofs] < key:
+                break
+            last, ofs = ofs, 2 * ofs + 1
+        last, ofs = hint + last, hint + min(ofs, limit)
+    else:
+        limit = hint + 1
+        while ofs < limit:
+            yield COMPARE, key_index, origin + hint - ofs
+            if a[start + hint - ofs] < key:
+                break
+            last, ofs = ofs, 2 * ofs + 1
+        last, ofs = hint - min(ofs, limit), hint - last
+
+    # a[last] < key <= a[ofs]
+    last += 1
+    while last < ofs:
+        mid = last + (ofs - last) // 2
+        yield COMPARE, key_index, origin + mid
+        if a[start + mid] < key:
+            last = mid + 1
+        else:
+            ofs = mid
+    return ofs
+
+
+def gallop_right(key, key_index, a, start, n, hint, origin):
+    # number of elements of a[start:start + n] smaller than or equal to key
+    last, ofs = 0, 1
+    yield COMPARE, key_index, origin + hint
+    if key < a[start + hint]:
+        limit = hint + 1
+        while ofs < limit:
+            yield COMPARE, key_index, origin + hint - ofs
+            if not key < a[start + hint - ofs]:
+                break
+            last, ofs = ofs, 2 * ofs + 1
+        last, ofs = hint - min(ofs, limit), hint - last
+    else:
+        limit = n - hint
+        while ofs < limit:
+            yield COMPARE, key_index, origin + hint + ofs
+            if key < a[start + hint + ofs]:
+                break
+            last, ofs = ofs, 2 * ofs + 1
+        last, ofs = hint + last, hint + min(ofs, limit)
+
+    # a[last] <= key < a[ofs]
+    last += 1
+    while last < ofs:
+        mid = last + (ofs - last) // 2
+        yield COMPARE, key_index, origin + mid
+        if key < a[start + mid]:
+            ofs = mid
+        else:
+            last = mid + 1
+    return ofs
+
+
+def merge_runs(lst, base_a, len_a, base_b, len_b, min_gallop):
+    # merges the adjacent runs a and b with the left run in a buffer,
+    # returns the updated galloping threshold
+    yield MARK, base_a, base_b + len_b - 1
+
+    # elements of a not larger than b[0] and of b not smaller than a[-1]
+    # are already in place
+    k = yield from gallop_right(lst[base_b], base_b, lst, base_a, len_a, 0, base_a)
+    base_a += k
+    len_a -= k
+    if len_a == 0:
+        return min_gallop
+    len_b = yield from gallop_left(lst[base_a + len_a - 1], base_a + len_a - 1, lst, base_b, len_b, len_b - 1,
+                                   base_b)
+    if len_b == 0:
+        return min_gallop
+
+    tmp = lst[base_a:base_a + len_a]
+    yield ALLOC, len_a
+    i, j, dest = 0, base_b, base_a
+
+    # b[0] is smaller than a[0]
+    yield WRITE, dest, lst[j]
+    dest += 1
+    j += 1
+    len_b -= 1
+
+    while len_a > 1 and len_b > 0:
+        # one element at a time until a run keeps winning
+        a_count = b_count = 0
+        while len_a > 1 and len_b > 0 and max(a_count, b_count) < min_gallop:
+            yield COMPARE, j, base_a + i
+            if lst[j] < tmp[i]:
+                yield WRITE, dest, lst[j]
+                j += 1
+                len_b -= 1
+                b_count += 1
+                a_count = 0
+            else:
+                yield WRITE, dest, tmp[i]
+                i += 1
+                len_a -= 1
+                a_count += 1
+                b_count = 0
+            dest += 1
+
+        # galloping, whole stretches of one run are copied at once
+        min_gallop += 1
+        while len_a > 1 and len_b > 0:
+            min_gallop -= min_gallop > 1
+            a_count = yield from gallop_right(lst[j], j, tmp, i, len_a, 0, base_a + i)
+            for _ in range(a_count):
+                yield WRITE, dest, tmp[i]
+                dest += 1
+                i += 1
+            len_a -= a_count
+            if len_a <= 1:
+                break
+
+            yield WRITE, dest, lst[j]
+            dest += 1
+            j += 1
+            len_b -= 1
+            if len_b == 0:
+                break
+
+            b_count = yield from gallop_left(tmp[i], base_a + i, lst, j, len_b, 0, j)
+            for _ in range(b_count):
+                yield WRITE, dest, lst[j]
+                dest += 1
+                j += 1
+            len_b -= b_count
+            if len_b == 0:
+                break
+
+            yield WRITE, dest, tmp[i]
+            dest += 1
+            i += 1
+            len_a -= 1
+            if a_count < MIN_GALLOP and b_count < MIN_GALLOP:
+                min_gallop += 1
+                break
+
+    if len_b == 0:
+        # the rest of a goes to the end
+        for k in range(i, i + len_a):
+            yield WRITE, dest, tmp[k]
+            dest += 1
+    else:
+        # a single element of a is left, it is larger than the rest of b
+        for k in range(len_b):
+            yield WRITE, dest + k, lst[j + k]
+        yield WRITE, dest + len_b, tmp[i]
+
+    yield FREE, len(tmp)
+    return min_gallop
+
+
+def tim_sort(lst):
+    # natural runs extended to minrun by binary insertion sort and merged
+    # with galloping while keeping the run lengths balanced
+    n = len(lst)
+    if n < 2:
+        return
+
+    minrun, rest = n, 0
+    while minrun >= 64:
+        rest |= minrun & 1
+        minrun >>= 1
+    minrun += rest
+
+    runs = []
+    min_gallop = MIN_GALLOP
+    lo = 0
+    while lo < n:
+        # find the next natural run, strictly descending ones are reversed
+        hi = lo + 1
+        if hi < n:
+            yield COMPARE, hi - 1, hi
+            if lst[hi] < lst[hi - 1]:
+                while hi + 1 < n:
+                    yield COMPARE, hi, hi + 1
+                    if not lst[hi + 1] < lst[hi]:
+                        break
+                    hi += 1
+                for k in range((hi - lo + 1) // 2):
+                    yield SWAP, lo + k, hi - k
+            else:
+                while hi + 1 < n:
+                    yield COMPARE, hi, hi + 1
+                    if lst[hi + 1] < lst[hi]:
+                        break
+                    hi += 1
+        run = hi - lo + 1
+
+        # extend short runs with binary insertion sort
+        if run < minrun:
+            end = min(lo + minrun, n)
+            for i in range(lo + run, end):
+                current = lst[i]
+                yield CLEAR,
+                yield HIGHLIGHT, i, GREEN
+                left, right = lo, i
+                while left < right:
+                    mid = (left + right) // 2
+                    yield COMPARE, mid, i
+                    if current < lst[mid]:
+                        right = mid
+                    else:
+                        left = mid + 1
+                for k in range(i, left, -1):
+                    yield WRITE, k, lst[k - 1]
+                if left != i:
+                    yield WRITE, left, current
+            run = end - lo
+
+        runs.append([lo, run])
+        lo += run
+
+        # merge until the run lengths shrink fast enough towards the top
+        while len(runs) > 1:
+            k = len(runs) - 2
+            if k > 0 and runs[k - 1][1] <= runs[k][1] + runs[k + 1][1] or \
+                    k > 1 and runs[k - 2][1] <= runs[k - 1][1] + runs[k][1]:
+                if runs[k - 1][1] < runs[k + 1][1]:
+                    k -= 1
+            elif runs[k][1] > runs[k + 1][1]:
+                break
+            min_gallop = yield from merge_runs(lst, runs[k][0], runs[k][1], runs[k + 1][0], runs[k + 1][1],
+                                               min_gallop)
+            runs[k][1] += runs[k + 1][1]
+            del runs[k + 1]
+
+    # merge whatever is left
+    while len(runs) > 1:
+        k = len(runs) - 2
+        if k > 0 and runs[k - 1][1] < runs[k + 1][1]:
+            k -= 1
+        min_gallop = yield from merge_runs(lst, runs[k][0], runs[k][1], runs[k + 1][0], runs[k + 1][1], min_gallop)
+        runs[k][1] += runs[k + 1][1]
+        del runs[k + 1]
+    yield CLEAR,
+
+
+# algorithms in grid order
+ALGORITHMS = [
+    ("Bubble Sort", bubble_sort),
+    ("Insertion Sort", insertion_sort),
+    ("Quick Sort", quick_sort),
+    ("Merge Sort", merge_sort),
+    ("Miracle Sort", miracle_sort),
+    ("Selection Sort", selection_sort),
+    ("Sleep Sort", sleep_sort),
+    ("Quantum BogoSort", quantum_bogosort),
+    ("Cocktail Sort", cocktail_sort),
+    ("Brutal Sort", brutal_sort),
+    ("Stalin Sort", stalin_sort),
+    ("Bogo Sort", bogo_sort),
+]
+
+# second bank, algorithms used in production next to the practical ones above
+PRODUCTION_ALGORITHMS = [
+    ("Heap Sort", heap_sort),
+    ("Shell Sort", shell_sort),
+    ("Intro Sort", intro_sort),
+    ("Radix Sort", radix_sort),
+    ("Counting Sort", counting_sort),
+    ("Tim Sort", tim_sort),
+    ("Quick Sort", quick_sort),
+    ("Merge Sort", merge_sort),
+    ("Insertion Sort", insertion_sort),
+    ("Selection Sort", selection_sort),
+    ("Bubble Sort", bubble_sort),
+    ("External Merge Sort", external_merge_sort),
+]
+
+# the banks the grid switches between
+BANKS = [ALGORITHMS, PRODUCTION_ALGORITHMS]
+
+# every algorithm once, for the benchmarks and lookups by function name
+ALL_ALGORITHMS = ALGORITHMS + [entry for entry in PRODUCTION_ALGORITHMS if entry not in ALGORITHMS]
@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from algorithms import ALL_ALGORITHMS
+from distributions import DISTRIBUTIONS, generate
+from engine import OpCounters, run_headless
+from percentiles import percentile
+from sortedness import is_sorted
+
+FIELDS = ("algorithm", "n", "comparisons", "swaps", "writes", "deletes", "peak_aux", "disk_reads", "disk_writes",
+          "seconds", "completed", "sorted")
+
+# metrics summarized by a sweep, each gets a mean, median and p95 column
+SWEEP_METRICS = ("comparisons", "swaps", "writes", "seconds")
+SWEEP_FIELDS = ("algorithm", "n", "distribution", "runs", "completed") + tuple(
+    f"{metric}_{stat}" for metric in SWEEP_METRICS for stat in ("mean", "median", "p95")
+)
+
+
+def run_one(name, algorithm, original, seed, max_steps):
+    lst = original.copy()
+    counters = OpCounters()
+    random.seed(seed)  # the joke sorts draw from the global generator
+
+    start = time.perf_counter()
+    completed = run_headless(algorithm, lst, counters, max_steps)
+    seconds = time.perf_counter() - start
+
+    row = {"algorithm": name, "n": len(original)}
+    row.update(counters.as_dict())
+    del row["aux"], row["sorted_runs"], row["merge_passes"]
+    row.update(seconds=round(seconds, 6), completed=completed, sorted=is_sorted(lst))
+    return row
+
+
+def run_benchmark(algorithms, sizes, min_val=5, max_val=100, seed=0, max_steps=None):
+    # every algorithm sorts the same input for every size, yields one row
+    # per run as soon as it is done
+    for n in sizes:
+        original = generate("uniform", n, min_val, max_val, seed)
+        for name, algorithm in algorithms:
+            yield run_one(name, algorithm, original, seed, max_steps)
+
+
+def run_cell(function_name, n, distribution, seed, max_steps, min_val=5, max_val=100):
+    # a single sweep cell, runs in a worker process so it only gets picklable
+    # arguments and looks the algorithm up by its function name
+    name, algorithm = next((name, fn) for name, fn in ALL_ALGORITHMS if fn.__name__ == function_name)
+    original = generate(distribution, n, min_val, max_val, seed)
+    row = run_one(name, algorithm, original, seed, max_steps)
+    row["distribution"] = distribution
+    return row
+
+
+def summarize(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["algorithm"], row["n"], row["distribution"]), []).append(row)
+
+    summary = []
+    for (name, n, distribution), group in groups.items():
+        entry = {"algorithm": name, "n": n, "distribution": distribution, "runs": len(group),
+                 "completed": sum(row["completed"] for row in group)}
+        for metric in SWEEP_METRICS:
+            values = [row[metric] for row in group]
+            entry[f"{metric}_mean"] = round(statistics.fmean(values), 6)
+            entry[f"{metric}_median"] = round(statistics.median(values), 6)
+            entry[f"{metric}_p95"] = round(percentile(values, 95), 6)
+        summary.append(entry)
+
+    order = {fn.__name__: k for k, (_, fn) in enumerate(ALL_ALGORITHMS)}
+    names = {name: fn.__name__ for name, fn in ALL_ALGORITHMS}
+    summary.sort(key=lambda e: (e["n"], list(DISTRIBUTIONS).index(e["distribution"]), order[names[e["algorithm"]]]))
+    return summary
+
+
+def run_sweep(algorithms, sizes, distributions, seeds, max_steps=None, workers=None):
+    # fan the algorithm x size x distribution x seed matrix out over all
+    # cores, the cells are independent so this scales with the core count,
+    # rows are yielded as they finish
+    cells = [(fn.__name__, n, distribution, seed)
+             for n in sizes for distribution in distributions for seed in seeds for _, fn in algorithms]
+    # largest lists first so the slow cells do not end up last
+    cells.sort(key=lambda cell: -cell[1])
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(run_cell, *cell, max_steps) for cell in cells]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_table(rows, fields=FIELDS):
+    cells = [[str(row[field]) for field in fields] for row in rows]
+    widths = [max(len(field), *(len(line[k]) for line in cells)) for k, field in enumerate(fields)]
+    lines = ["  ".join(field.ljust(width) for field, width in zip(fields, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    for line in cells:
+        lines.append("  ".join(cell.rjust(width) if k else cell.ljust(width)
+                               for k, (cell, width) in enumerate(zip(line, widths))))
+    return "\n".join(lines) + "\n"
+
+
+def write_report(rows, fmt, out, fields=FIELDS):
+    if fmt == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+    elif fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        out.write(format_table(rows, fields))
+
+
+def main(args):
+    algorithms = ALL_ALGORITHMS
+    if args.algorithms:
+        algorithms = [(name, fn) for name, fn in ALL_ALGORITHMS if fn.__name__ in args.algorithms]
+
+    if args.sweep:
+        seeds = range(args.seed, args.seed + args.seeds)
+        rows = run_sweep(algorithms, args.sizes, args.distributions, seeds, args.max_steps, args.workers)
+        fields = SWEEP_FIELDS
+    else:
+        rows = run_benchmark(algorithms, args.sizes, seed=args.seed, max_steps=args.max_steps)
+        fields = FIELDS
+
+    results = []
+    for row in rows:
+        # progress goes to stderr so the report itself can be piped
+        print(f"{row['algorithm']} n={row['n']} {row.get('distribution', '')}: {row['seconds']:.3f}s",
+              file=sys.stderr)
+        results.append(row)
+
+    if args.sweep:
+        results = summarize(results)
+
+    if args.output:
+        with open(args.output, "w", newline="") as out:
+            write_report(results, args.format, out, fields)
+    else:
+        write_report(results, args.format, sys.stdout, fields)
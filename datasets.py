@@ -0,0 +1,107 @@
+import csv
+import os
+
+import numpy as np
+
+# values of a file on disk: raw little-endian binaries are memory-mapped and
+# only the pages of the sampled elements are ever read, text is parsed in
+# chunks straight into numpy arrays
+BINARY_FORMATS = {"int32": "<i4", "int64": "<i8", "float64": "<f8"}
+FORMATS = ["csv", "lines"] + list(BINARY_FORMATS)
+EXTENSIONS = {".csv": "csv", ".i32": "int32", ".i64": "int64", ".f64": "float64"}
+CHUNK_SIZE = 1 << 20  # bytes of text parsed at a time
+SCAN_SIZE = 1 << 20  # elements looked at at a time when finding the value range
+
+
+def text_chunks(path):
+    # whole lines in blocks of about CHUNK_SIZE bytes
+    with open(path, newline="") as f:
+        rest = ""
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            lines = (rest + block).split("\n")
+            rest = lines.pop()
+            yield lines
+        if rest:
+            yield [rest]
+
+
+def parse_lines(path):
+    # one number per line, blank lines are skipped
+    for lines in text_chunks(path):
+        yield np.array([line for line in lines if line.strip()], dtype=np.float64)
+
+
+def parse_csv(path, column=0):
+    # one column of a csv file, by index or by header name. a first row whose
+    # field is not a number is taken as the header
+    index = None if isinstance(column, str) and not column.isdigit() else int(column)
+    first = True
+    for lines in text_chunks(path):
+        rows = csv.reader(lines)
+        if first:
+            header = next(rows, None)
+            if header is None:
+                continue
+            first = False
+            if index is None:
+                if column not in header:
+                    raise ValueError(f"{path} has no column named {column!r}")
+                index = header.index(column)
+            else:
+                try:
+                    float(header[index])
+                except ValueError:
+                    pass
+                else:
+                    rows = [header] + list(rows)
+        fields = [row[index] for row in rows if len(row) > index]
+        yield np.array([field for field in fields if field.strip()], dtype=np.float64)
+
+
+class Dataset:
+    # one column of numbers from a file, handed to the panels as a sample of
+    # evenly spaced elements quantized into the value range they draw
+
+    def __init__(self, path, fmt=None, column=0):
+        if fmt is None:
+            fmt = EXTENSIONS.get(os.path.splitext(path)[1].lower(), "lines")
+        self.name = os.path.basename(path)
+
+        if fmt in BINARY_FORMATS:
+            dtype = np.dtype(BINARY_FORMATS[fmt])
+            count = os.path.getsize(path) // dtype.itemsize
+            self.values = np.memmap(path, dtype=dtype, mode="r", shape=(count,)) if count else np.empty(0, dtype)
+        else:
+            chunks = parse_csv(path, column) if fmt == "csv" else parse_lines(path)
+            self.values = np.concatenate([np.empty(0)] + list(chunks))
+
+        self.low, self.high = self.value_range()
+
+    def __len__(self):
+        return len(self.values)
+
+    def value_range(self):
+        # min and max of the finite values, a block at a time so a mapped
+        # file is never copied as a whole
+        low, high = np.inf, -np.inf
+        for start in range(0, len(self.values), SCAN_SIZE):
+            block = self.values[start:start + SCAN_SIZE]
+            if block.dtype.kind == "f":
+                block = block[np.isfinite(block)]
+            if len(block):
+                low, high = min(low, block.min()), max(high, block.max())
+        if low > high:
+            raise ValueError(f"{self.name} holds no numbers")
+        return float(low), float(high)
+
+    def sample(self, n, min_val=5, max_val=100):
+        # at most n evenly spaced elements, linearly mapped onto the integers
+        # min_val to max_val. values that are not numbers end up at the bottom
+        count = len(self.values)
+        picked = self.values[np.arange(min(n, count)) * count // max(1, min(n, count))]
+        scale = (max_val - min_val) / (self.high - self.low) if self.high > self.low else 0.0
+        levels = np.rint((np.asarray(picked, dtype=np.float64) - self.low) * scale) + min_val
+        return np.clip(np.nan_to_num(levels, nan=min_val), min_val, max_val).astype(np.int64).tolist()
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class ColumnBuckets:
+    # min, max and last-touched value of every pixel column for lists that
+    # have more elements than the panel has columns, kept up to date from the
+    # written indices so drawing never has to look at the whole list
+
+    def __init__(self, lst, columns):
+        n = len(lst)
+        self.length = n
+        self.columns = columns
+        self.values = np.array(lst, dtype=np.int64)
+
+        # bucket b holds the indices bounds[b] up to bounds[b + 1]
+        self.bounds = np.arange(columns + 1) * n // columns
+        starts = self.bounds[:-1]
+        self.mins = np.minimum.reduceat(self.values, starts)
+        self.maxs = np.maximum.reduceat(self.values, starts)
+        self.last = self.values[self.bounds[1:] - 1].copy()
+
+    def bucket_of(self, indices):
+        return np.searchsorted(self.bounds, indices, side="right") - 1
+
+    def buckets_between(self, lo, hi):
+        return np.arange(self.bucket_of(lo), self.bucket_of(hi) + 1)
+
+    def update(self, lst, indices):
+        # fold the written indices into their buckets and return the buckets
+        # that changed, a bucket is only rescanned when its min or max was
+        # overwritten with something less extreme
+        if not indices:
+            return np.empty(0, dtype=np.int64)
+
+        indices = list(indices)
+        idx = np.fromiter(indices, dtype=np.int64, count=len(indices))
+        new = np.fromiter((lst[i] for i in indices), dtype=np.int64, count=len(indices))
+        old = self.values[idx]
+        self.values[idx] = new
+
+        buckets = self.bucket_of(idx)
+        self.last[buckets] = new
+        np.minimum.at(self.mins, buckets, new)
+        np.maximum.at(self.maxs, buckets, new)
+
+        stale = (new != old) & ((self.mins[buckets] == old) | (self.maxs[buckets] == old))
+        for b in np.unique(buckets[stale]):
+            segment = self.values[self.bounds[b]:self.bounds[b + 1]]
+            self.mins[b] = segment.min()
+            self.maxs[b] = segment.max()
+
+        return np.unique(buckets)
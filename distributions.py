@@ -0,0 +1,74 @@
+from functools import lru_cache
+
+import numpy as np
+
+# input distributions, every generator takes the list size, the value range
+# and a numpy Generator so that a seed always gives the same list
+
+
+def uniform(n, min_val, max_val, rng):
+    return rng.integers(min_val, max_val + 1, n)
+
+
+def ascending(n, min_val, max_val, rng):
+    return np.sort(uniform(n, min_val, max_val, rng))
+
+
+def descending(n, min_val, max_val, rng):
+    return ascending(n, min_val, max_val, rng)[::-1]
+
+
+def nearly_sorted(n, min_val, max_val, rng):
+    # sorted with one random swap per hundred elements
+    lst = ascending(n, min_val, max_val, rng)
+    if n > 1:
+        i, j = rng.integers(0, n, (2, max(1, n // 100)))
+        lst[i], lst[j] = lst[j], lst[i]
+    return lst
+
+
+def sawtooth(n, min_val, max_val, rng, teeth=8):
+    # ascending ramps over the whole value range
+    period = max(2, -(-n // teeth))
+    return min_val + np.arange(n) % period * (max_val - min_val) // (period - 1)
+
+
+def few_unique(n, min_val, max_val, rng):
+    return rng.choice(uniform(5, min_val, max_val, rng), n)
+
+
+def gaussian(n, min_val, max_val, rng):
+    # bell curve over the range, six standard deviations wide
+    values = rng.normal((min_val + max_val) / 2, (max_val - min_val) / 6, n)
+    return np.clip(np.rint(values), min_val, max_val).astype(np.int64)
+
+
+def zipf(n, min_val, max_val, rng):
+    # mostly the smallest values with a long tail towards the largest
+    return np.minimum(min_val + rng.zipf(1.5, n) - 1, max_val)
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "ascending": ascending,
+    "descending": descending,
+    "nearly_sorted": nearly_sorted,
+    "sawtooth": sawtooth,
+    "few_unique": few_unique,
+    "gaussian": gaussian,
+    "zipf": zipf,
+}
+
+
+@lru_cache(maxsize=32)
+def cached(distribution, n, min_val, max_val, seed):
+    values = DISTRIBUTIONS[distribution](n, min_val, max_val, np.random.default_rng(seed))
+    values.flags.writeable = False
+    return values
+
+
+def generate(distribution, n, min_val, max_val, seed=None):
+    # a fresh list every call, inputs with a seed are only generated once
+    if seed is None:
+        return DISTRIBUTIONS[distribution](n, min_val, max_val, np.random.default_rng()).tolist()
+    return cached(distribution, n, min_val, max_val, seed).tolist()
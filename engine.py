@@ -0,0 +1,465 @@
+import sys
+import time
+
+from sortedness import Sortedness, is_sorted
+
+# operation codes yielded by the sorting generators
+COMPARE = 0    # (COMPARE, i, j) - highlights i red and j green
+SWAP = 1       # (SWAP, i, j)
+WRITE = 2      # (WRITE, i, value)
+DELETE = 3     # (DELETE, i) - removes the element, the list gets shorter
+MARK = 4       # (MARK, lo, hi) - highlights the inclusive range lo..hi
+HIGHLIGHT = 5  # (HIGHLIGHT, i, colour) - adds a single highlight
+CLEAR = 6      # (CLEAR,) - drops all highlights
+WAIT = 7       # (WAIT, steps) - idles for a number of steps
+ALLOC = 8      # (ALLOC, n) - n elements of auxiliary memory taken
+FREE = 9       # (FREE, n) - n elements of auxiliary memory given back
+READ = 10      # (READ, n) - n elements read from disk
+FLUSH = 11     # (FLUSH, n) - n elements written to disk
+RUN = 12       # (RUN, pass) - a sorted run finished, pass 0 is run generation
+CHECK = 13     # (CHECK,) - asks whether the list is sorted, the answer is sent back into the generator
+KEYFRAME = 14  # (KEYFRAME,) - a timeline is about to snapshot the panel, the counters have to be up to date
+
+# highlight colour codes, the renderer maps them to real colours
+RED, GREEN, BLUE, PURPLE = range(4)
+
+
+class Highlights:
+    # highlighted indices of a panel in preallocated slots, so a step never
+    # allocates. a COMPARE takes the first two slots, every HIGHLIGHT the
+    # next free one and a later slot wins over an earlier one for the same
+    # index. the few algorithms that highlight more than CAPACITY elements
+    # at once (sleep sort) spill into a dict
+
+    CAPACITY = 64
+
+    __slots__ = ("indices", "colors", "count", "overflow")
+
+    def __init__(self):
+        self.indices = [0] * self.CAPACITY
+        self.colors = [0] * self.CAPACITY
+        self.count = 0
+        self.overflow = None
+
+    def __len__(self):
+        return self.count + (len(self.overflow) if self.overflow else 0)
+
+    def __iter__(self):
+        return (i for i, _ in self.items())
+
+    def items(self):
+        # (index, colour) pairs in the order they are drawn
+        yield from zip(self.indices[:self.count], self.colors[:self.count])
+        if self.overflow:
+            yield from self.overflow.items()
+
+    def clear(self):
+        self.count = 0
+        self.overflow = None
+
+    def pair(self, i, j):
+        self.indices[0] = i
+        self.colors[0] = RED
+        self.indices[1] = j
+        self.colors[1] = GREEN
+        self.count = 2
+        self.overflow = None
+
+    def add(self, i, color):
+        count = self.count
+        if count < self.CAPACITY:
+            self.indices[count] = i
+            self.colors[count] = color
+            self.count = count + 1
+        else:
+            if self.overflow is None:
+                self.overflow = {}
+            self.overflow[i] = color
+
+    def nbytes(self):
+        # rough memory of a copy, the slot lists plus the overflow dict
+        size = 2 * 8 * self.CAPACITY
+        if self.overflow:
+            size += sys.getsizeof(self.overflow) + 28 * len(self.overflow)
+        return size
+
+    def copy(self):
+        highlights = Highlights()
+        highlights.indices[:] = self.indices
+        highlights.colors[:] = self.colors
+        highlights.count = self.count
+        highlights.overflow = dict(self.overflow) if self.overflow else None
+        return highlights
+
+
+class SortState:
+    # list, highlights and generator of a single running algorithm
+
+    def __init__(self, lst):
+        self.reset(lst)
+
+    def reset(self, lst):
+        self.lst = lst
+        self.steps = None
+        self.waiting = 0
+        self.highlights = Highlights()
+        self.mark_range = None
+        self.sorting_complete = False
+        # indices written since the renderer last looked, or a full redraw
+        # when the whole list moved
+        self.dirty = set()
+        self.needs_redraw = True
+        self.counters = OpCounters()
+        self.elapsed = 0  # steps of simulated time used, waits included
+        # made on first use and kept up to date from the dirty indices after
+        # that, whoever clears them updates it first
+        self.sortedness = None
+
+    def measure(self, inversions=False):
+        # the sortedness tracker, up to date with the list, made again when
+        # inversions are asked of one that does not count them
+        tracker = self.sortedness
+        if tracker is not None and not self.needs_redraw and (tracker.counting or not inversions):
+            tracker.update(self.lst, self.dirty)
+        else:
+            counting = inversions or tracker is not None and tracker.counting
+            self.sortedness = Sortedness(self.lst, counting)
+        return self.sortedness
+
+    def start(self, algorithm):
+        self.steps = algorithm(self.lst)
+        self.waiting = 0
+        self.sorting_complete = False
+        self.counters = OpCounters()
+        self.elapsed = 0
+
+    def finish(self):
+        self.steps = None
+        self.waiting = 0
+        self.highlights.clear()
+        self.mark_range = None
+        self.sorting_complete = True
+
+    def advance(self, budget):
+        # apply operations until the step budget is used up, highlight
+        # changes are free, everything else costs one step
+        steps = self.steps
+        if steps is None:
+            return
+
+        lst = self.lst
+        dirty = self.dirty
+        counters = self.counters
+        highlights = self.highlights
+        # compares fill the first two highlight slots in place
+        hl_indices = highlights.indices
+        hl_colors = highlights.colors
+        # counted in locals and added to the counters once the budget is spent
+        # or a timeline asks for a keyframe
+        comparisons = swaps = writes = deletes = 0
+        answer = None  # for a CHECK, sent along with the next resume
+        start_budget = budget
+        while budget > 0:
+            if self.waiting:
+                spent = min(self.waiting, budget)
+                self.waiting -= spent
+                budget -= spent
+                continue
+
+            try:
+                op = steps.send(answer)
+            except StopIteration:
+                self.finish()
+                break
+            answer = None
+
+            code = op[0]
+            if code == COMPARE:
+                hl_indices[0] = op[1]
+                hl_colors[0] = RED
+                hl_indices[1] = op[2]
+                hl_colors[1] = GREEN
+                highlights.count = 2
+                if highlights.overflow:
+                    highlights.overflow = None
+                self.mark_range = None
+                comparisons += 1
+            elif code == SWAP:
+                i, j = op[1], op[2]
+                lst[i], lst[j] = lst[j], lst[i]
+                dirty.add(i)
+                dirty.add(j)
+                swaps += 1
+            elif code == WRITE:
+                lst[op[1]] = op[2]
+                dirty.add(op[1])
+                writes += 1
+            elif code == DELETE:
+                del lst[op[1]]
+                self.needs_redraw = True
+                deletes += 1
+            elif code == MARK:
+                self.mark_range = op[1], op[2]
+                continue
+            elif code == HIGHLIGHT:
+                highlights.add(op[1], op[2])
+                continue
+            elif code == CLEAR:
+                highlights.clear()
+                self.mark_range = None
+                continue
+            elif code == WAIT:
+                self.waiting = op[1]
+                continue
+            elif code == ALLOC:
+                counters.aux += op[1]
+                if counters.aux > counters.peak_aux:
+                    counters.peak_aux = counters.aux
+                continue
+            elif code == FREE:
+                counters.aux -= op[1]
+                continue
+            elif code == CHECK:
+                answer = self.measure().is_sorted
+                continue
+            elif code == KEYFRAME:
+                self.elapsed += start_budget - budget
+                start_budget = budget
+                counters.comparisons += comparisons
+                counters.swaps += swaps
+                counters.writes += writes
+                counters.deletes += deletes
+                comparisons = swaps = writes = deletes = 0
+                continue
+            elif code >= READ:
+                counters.disk(code, op[1])
+                continue
+
+            budget -= 1
+
+        self.elapsed += start_budget - budget
+        counters.comparisons += comparisons
+        counters.swaps += swaps
+        counters.writes += writes
+        counters.deletes += deletes
+
+
+class OpCounters:
+    # what an algorithm did, plain int slots so counting stays cheap
+
+    __slots__ = ("comparisons", "swaps", "writes", "deletes", "aux", "peak_aux",
+                 "disk_reads", "disk_writes", "sorted_runs", "merge_passes")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def disk(self, code, n):
+        # elements moved to and from disk by an external sort, runs are
+        # counted when they are generated and passes by the highest one seen
+        if code == READ:
+            self.disk_reads += n
+        elif code == FLUSH:
+            self.disk_writes += n
+        elif code == RUN:
+            if n == 0:
+                self.sorted_runs += 1
+            self.merge_passes = max(self.merge_passes, n)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def copy(self):
+        counters = OpCounters()
+        for name in self.__slots__:
+            setattr(counters, name, getattr(self, name))
+        return counters
+
+
+def run_headless(algorithm, lst, counters, max_steps=None):
+    # apply the operations without highlights or waits and count them,
+    # returns whether the algorithm finished within max_steps
+    steps = 0
+    generator = algorithm(lst)
+    answer = None
+    while True:
+        try:
+            op = generator.send(answer)
+        except StopIteration:
+            break
+        answer = None
+
+        code = op[0]
+        if code == COMPARE:
+            counters.comparisons += 1
+        elif code == SWAP:
+            i, j = op[1], op[2]
+            lst[i], lst[j] = lst[j], lst[i]
+            counters.swaps += 1
+        elif code == WRITE:
+            lst[op[1]] = op[2]
+            counters.writes += 1
+        elif code == DELETE:
+            del lst[op[1]]
+            counters.deletes += 1
+        elif code == ALLOC:
+            counters.aux += op[1]
+            if counters.aux > counters.peak_aux:
+                counters.peak_aux = counters.aux
+            continue
+        elif code == FREE:
+            counters.aux -= op[1]
+            continue
+        else:
+            if code == CHECK:
+                # nothing keeps track of the written indices here, so the
+                # list is scanned
+                answer = is_sorted(lst)
+            elif code >= READ:
+                counters.disk(code, op[1])
+            continue
+
+        steps += 1
+        if max_steps and steps >= max_steps:
+            return False
+
+    return True
+
+
+def apply_ops(state, ops):
+    # apply operations at once without pacing, waits only add to the elapsed
+    # simulated time
+    lst = state.lst
+    counters = state.counters
+    for op in ops:
+        code = op[0]
+        if code == COMPARE:
+            state.highlights.pair(op[1], op[2])
+            state.mark_range = None
+            counters.comparisons += 1
+        elif code == SWAP:
+            i, j = op[1], op[2]
+            lst[i], lst[j] = lst[j], lst[i]
+            counters.swaps += 1
+        elif code == WRITE:
+            lst[op[1]] = op[2]
+            counters.writes += 1
+        elif code == DELETE:
+            del lst[op[1]]
+            counters.deletes += 1
+        elif code == MARK:
+            state.mark_range = op[1], op[2]
+            continue
+        elif code == HIGHLIGHT:
+            state.highlights.add(op[1], op[2])
+            continue
+        elif code == CLEAR:
+            state.highlights.clear()
+            state.mark_range = None
+            continue
+        elif code == WAIT:
+            state.elapsed += op[1]
+            continue
+        elif code == ALLOC:
+            counters.aux += op[1]
+            counters.peak_aux = max(counters.peak_aux, counters.aux)
+            continue
+        elif code == FREE:
+            counters.aux -= op[1]
+            continue
+        elif code >= READ:
+            # a CHECK was answered when the operation was first applied
+            counters.disk(code, op[1])
+            continue
+
+        state.elapsed += 1
+
+
+class Scheduler:
+    # owns the simulated clock and hands every running algorithm the same
+    # number of steps per tick, so pacing lives in one place
+
+    BASE_RATE = 100  # steps per simulated second at 1x, one step used to be a 0.01 s sleep
+    SPEEDS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+    CHUNK = 256  # steps given to each algorithm in turn
+    MAX_TICK_TIME = 0.012  # wall-clock seconds a tick may spend sorting
+    TIMELINES = True  # the panels run in this process, so their history can be kept
+
+    def __init__(self, states=(), speed=25):
+        self.speed_index = self.SPEEDS.index(speed)
+        self.paused = False
+        self.reset(states)
+
+    def reset(self, states):
+        self.states = list(states)
+        self.owed = 0.0  # fractional steps carried over to the next tick
+        self.finishing = False
+
+    def start(self, states, algorithms):
+        for state, algorithm in zip(states, algorithms):
+            state.start(algorithm)
+        self.reset(states)
+
+    def shutdown(self):
+        # everything runs in the calling thread, nothing to clean up
+        pass
+
+    @property
+    def speed(self):
+        return self.SPEEDS[self.speed_index]
+
+    def faster(self):
+        self.speed_index = min(len(self.SPEEDS) - 1, self.speed_index + 1)
+
+    def slower(self):
+        self.speed_index = max(0, self.speed_index - 1)
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def single_step(self):
+        # pause and advance every algorithm by exactly one step
+        self.paused = True
+        self.run(1)
+
+    def finish(self):
+        # run every algorithm to completion as fast as the cpu allows
+        self.finishing = True
+
+    @property
+    def running(self):
+        return any(state.steps is not None for state in self.states)
+
+    def tick(self, dt):
+        # advance the simulated clock by dt wall-clock seconds
+        if self.finishing:
+            self.run(float("inf"), self.MAX_TICK_TIME)
+            self.finishing = self.running
+            return
+
+        if self.paused:
+            return
+
+        # a hitch must not turn into a burst of millions of steps
+        self.owed += min(dt, 0.1) * self.speed * self.BASE_RATE
+        budget = int(self.owed)
+        self.owed -= budget
+        if budget:
+            self.run(budget, self.MAX_TICK_TIME)
+
+    def run(self, budget, time_limit=None):
+        # round-robin the budget over the algorithms in chunks, whatever does
+        # not fit into the time limit is dropped so the ui stays responsive
+        deadline = time.perf_counter() + time_limit if time_limit else None
+        while budget > 0:
+            chunk = min(budget, self.CHUNK)
+            running = [state for state in self.states if state.steps is not None]
+            if not running:
+                return
+
+            for state in running:
+                state.advance(chunk)
+            budget -= chunk
+
+            if deadline and time.perf_counter() > deadline:
+                return
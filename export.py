@@ -0,0 +1,137 @@
+import os
+import queue
+import random
+import shutil
+import subprocess
+import sys
+import threading
+from array import array
+
+FRAME_QUEUE = 8  # frames waiting for the encoder at most, rendering blocks beyond that
+HOLD_TIME = 1.0  # seconds the finished grid stays on screen at the end of a clip
+
+
+class FFmpegEncoder:
+    # pipes raw rgb frames into an ffmpeg process, the container and codec
+    # follow from the output file name (.mp4, .webm, .gif, ...)
+
+    def __init__(self, path, size, fps):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg was not found, install it or export png frames instead")
+
+        command = [ffmpeg, "-loglevel", "error", "-y",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps),
+                   "-i", "-"]
+        if not path.endswith(".gif"):
+            command += ["-pix_fmt", "yuv420p"]
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self.process.stdin.write(frame)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait():
+            raise RuntimeError(f"ffmpeg exited with status {self.process.returncode}")
+
+
+class PngEncoder:
+    # numbered png files in a directory, needs nothing but pygame
+
+    def __init__(self, path, size, fps):
+        import pygame
+
+        os.makedirs(path, exist_ok=True)
+        self.pygame = pygame
+        self.path = path
+        self.size = size
+        self.count = 0
+
+    def write(self, frame):
+        surface = self.pygame.image.frombytes(frame, self.size, "RGB")
+        self.pygame.image.save(surface, os.path.join(self.path, f"frame_{self.count:06d}.png"))
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+def encode(frames, encoder, errors):
+    # encoder thread, runs until it takes None off the queue
+    try:
+        while True:
+            frame = frames.get()
+            if frame is None:
+                break
+            encoder.write(frame)
+        encoder.close()
+    except Exception as error:
+        errors.append(error)
+        # keep draining so the renderer never blocks on a dead encoder
+        while frames.get() is not None:
+            pass
+
+
+def export(path, n=100, seed=0, speed=25, fps=30, duration=60.0, size=(1920, 980), renderer="rect", bank=0,
+           distribution="uniform", dataset=None):
+    # render the grid offscreen at a fixed simulated frame rate until every
+    # algorithm is done or duration runs out, returns the number of frames
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import visualizer
+    from algorithms import BANKS
+    from engine import Scheduler
+
+    random.seed(seed)  # the joke sorts draw from the global generator
+    if dataset:
+        original_list = array("i", dataset.sample(n, 5, 100))
+    else:
+        original_list = visualizer.generate_starting_list(n, 5, 100, seed, distribution)
+    surface = pygame.Surface(size)
+    algorithms = BANKS[bank]
+    algo_infos = visualizer.layout_panels(surface, original_list, [name for name, _ in algorithms], renderer)
+
+    # no wall-clock limit on a tick, every run sorts the same steps per frame
+    scheduler = Scheduler(speed=speed)
+    scheduler.MAX_TICK_TIME = None
+    scheduler.TIMELINES = False
+    visualizer.restart_sorting(algo_infos, original_list, scheduler, algorithms)
+
+    encoder = PngEncoder if os.path.splitext(path)[1] == "" else FFmpegEncoder
+    frames = queue.Queue(FRAME_QUEUE)
+    errors = []
+    thread = threading.Thread(target=encode, args=(frames, encoder(path, size, fps), errors), daemon=True)
+    thread.start()
+
+    count = 0
+    hold = int(HOLD_TIME * fps)
+    try:
+        for count in range(1, int(duration * fps) + 1):
+            scheduler.tick(1 / fps)
+            visualizer.draw(surface, algo_infos, scheduler=scheduler, redraw_all=count == 1)
+            frames.put(pygame.image.tobytes(surface, "RGB"))
+
+            if errors:
+                break
+            if not scheduler.running:
+                hold -= 1
+                if hold < 0:
+                    break
+    finally:
+        frames.put(None)
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return count
+
+
+def main(args):
+    from datasets import Dataset
+
+    dataset = Dataset(args.data, args.data_format, args.column) if args.data else None
+    width, height = (int(x) for x in args.resolution.lower().split("x"))
+    frames = export(args.export, args.size, args.seed, args.speed, args.fps, args.duration, (width, height),
+                    args.renderer, args.bank - 1, args.distribution, dataset)
+    print(f"{frames} frames written to {args.export}", file=sys.stderr)
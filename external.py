@@ -0,0 +1,100 @@
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+
+from datasets import BINARY_FORMATS, EXTENSIONS
+
+# external merge sort of raw binary files, the same passes the External
+# Merge Sort panel shows but on a real file: runs of `memory` elements are
+# sorted in memory and written to temporary files, then fan_in runs at a
+# time are merged through a heap with one read buffer per run and one write
+# buffer, so memory stays bounded whatever the size of the file
+MEMORY = 1 << 22  # elements sorted in memory at a time
+FAN_IN = 16
+
+
+def read_blocks(path, dtype, block, stats):
+    # the values of a run, read block elements at a time
+    with open(path, "rb") as f:
+        while True:
+            values = np.fromfile(f, dtype=dtype, count=block)
+            if not len(values):
+                break
+            stats["bytes_read"] += values.nbytes
+            yield from values.tolist()
+
+
+def merge_files(paths, out_path, dtype, block, stats):
+    buffer = []
+    with open(out_path, "wb") as out:
+        for val in heapq.merge(*(read_blocks(path, dtype, block, stats) for path in paths)):
+            buffer.append(val)
+            if len(buffer) == block:
+                stats["bytes_written"] += write_block(out, buffer, dtype)
+                buffer = []
+        stats["bytes_written"] += write_block(out, buffer, dtype)
+
+
+def write_block(out, values, dtype):
+    block = np.array(values, dtype=dtype)
+    block.tofile(out)
+    return block.nbytes
+
+
+def external_sort_file(src, dst, dtype="<i8", memory=MEMORY, fan_in=FAN_IN, tmpdir=None):
+    # sorts the raw binary file src into dst and returns how much io it took
+    dtype = np.dtype(dtype)
+    block = max(1, memory // (fan_in + 1))
+    stats = {"runs": 0, "passes": 0, "bytes_read": 0, "bytes_written": 0}
+    workdir = tempfile.mkdtemp(prefix="sortrun", dir=tmpdir)
+    try:
+        runs = []
+        with open(src, "rb") as f:
+            while True:
+                values = np.fromfile(f, dtype=dtype, count=memory)
+                if not len(values):
+                    break
+                stats["bytes_read"] += values.nbytes
+                values.sort(kind="stable")
+                path = os.path.join(workdir, f"run0_{len(runs)}")
+                values.tofile(path)
+                stats["bytes_written"] += values.nbytes
+                runs.append(path)
+        stats["runs"] = len(runs)
+
+        while len(runs) > 1:
+            stats["passes"] += 1
+            merged = []
+            for g in range(0, len(runs), fan_in):
+                group = runs[g:g + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                path = os.path.join(workdir, f"run{stats['passes']}_{len(merged)}")
+                merge_files(group, path, dtype, block, stats)
+                for old in group:
+                    os.remove(old)
+                merged.append(path)
+            runs = merged
+
+        if runs:
+            shutil.move(runs[0], dst)
+        else:
+            open(dst, "wb").close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return stats
+
+
+def main(args):
+    src, dst = args.external_sort
+    fmt = args.data_format or EXTENSIONS.get(os.path.splitext(src)[1].lower())
+    if fmt not in BINARY_FORMATS:
+        raise SystemExit("--external-sort needs a raw int32, int64 or float64 file, pass --data-format")
+    stats = external_sort_file(src, dst, BINARY_FORMATS[fmt], args.memory, args.fan_in)
+    print(f"{stats['runs']} runs, {stats['passes']} merge passes, {stats['bytes_read']:,} bytes read, "
+          f"{stats['bytes_written']:,} bytes written", file=sys.stderr)
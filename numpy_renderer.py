@@ -0,0 +1,134 @@
+import numpy as np
+import pygame
+
+from decimate import ColumnBuckets
+from engine import PURPLE
+
+# palette slots of the 8-bit panel surfaces
+BACKGROUND_SLOT = 0
+GRADIENT_SLOT = 1   # three gradient colours
+HIGHLIGHT_SLOT = 4  # highlight colours in engine order
+RANGE_SLOT = 8      # spread between min and max of a decimated column
+LAST_SLOT = 9       # last touched value of a decimated column
+
+
+class BarRaster:
+    # bar heights of one panel kept in a numpy array and rasterized into an
+    # 8-bit palette buffer in one pass
+
+    def __init__(self, draw_info):
+        lst = draw_info.lst
+        n = len(lst)
+        self.length = n
+        self.width = draw_info.width
+        self.height = draw_info.height - draw_info.TITLE_HEIGHT
+
+        if draw_info.decimated:
+            # one pixel column per bucket of elements
+            self.buckets = ColumnBuckets(lst, draw_info.columns)
+            self.x0 = draw_info.start_x
+            self.x1 = draw_info.start_x + draw_info.columns
+            self.index = None
+            self.gradient = (GRADIENT_SLOT + np.arange(draw_info.columns) % 3).astype(np.uint8)
+        else:
+            # every pixel column shows the element that falls into it, bars
+            # that would overflow the panel are squeezed into it
+            self.buckets = None
+            self.heights = np.array(lst, dtype=np.int64)
+            span = draw_info.block_width * n
+            if span <= 0 or span > self.width - draw_info.start_x:
+                span = draw_info.columns
+            self.x0 = min(draw_info.start_x, self.width)
+            self.x1 = min(draw_info.start_x + span, self.width) if n else self.x0
+            self.index = np.arange(self.x1 - self.x0) * n // max(1, span)
+            self.gradient = (GRADIENT_SLOT + self.index % 3).astype(np.uint8)
+
+        self.rows = np.arange(self.height)
+        self.buffer = np.zeros((self.width, self.height), dtype=np.uint8)
+        self.surface = pygame.Surface((self.width, self.height), depth=8)
+        self.surface.set_palette(
+            [draw_info.BACKGROUND_COLOR] + list(draw_info.GRADIENTS) + list(draw_info.HIGHLIGHT_COLORS)
+            + [draw_info.RANGE_COLOR, draw_info.LAST_COLOR]
+        )
+
+    def matches(self, draw_info):
+        return (self.length == len(draw_info.lst) and self.width == draw_info.width
+                and self.height == draw_info.height - draw_info.TITLE_HEIGHT)
+
+    def update(self, lst, indices):
+        if self.buckets:
+            self.buckets.update(lst, indices)
+        elif indices:
+            idx = np.fromiter(indices, dtype=np.int64, count=len(indices))
+            self.heights[idx] = [lst[i] for i in indices]
+
+    def column_colors(self, draw_info):
+        colors = self.gradient.copy()
+        highlights = draw_info.highlights
+        buckets = self.buckets
+        index = self.index
+
+        if draw_info.mark_range:
+            lo, hi = draw_info.mark_range
+            if buckets:
+                colors[buckets.bucket_of(lo):buckets.bucket_of(hi) + 1] = HIGHLIGHT_SLOT + PURPLE
+            else:
+                colors[(index >= lo) & (index <= hi)] = HIGHLIGHT_SLOT + PURPLE
+
+        if buckets and highlights:
+            pairs = np.array(list(highlights.items()), dtype=np.int64)
+            # a delete can leave a highlight one past the end of the list
+            pairs = pairs[pairs[:, 0] < self.length]
+            colors[buckets.bucket_of(pairs[:, 0])] = pairs[:, 1] + HIGHLIGHT_SLOT
+        elif len(highlights) > 16:
+            # sleep sort and friends highlight thousands of elements at once
+            pairs = np.array(list(highlights.items()), dtype=np.int64)
+            pairs = pairs[pairs[:, 0] < self.length]
+            lookup = np.zeros(self.length, dtype=np.uint8)
+            lookup[pairs[:, 0]] = pairs[:, 1] + HIGHLIGHT_SLOT
+            highlighted = lookup[index]
+            colors = np.where(highlighted > 0, highlighted, colors)
+        else:
+            for i, color in highlights.items():
+                colors[index == i] = HIGHLIGHT_SLOT + color
+
+        return colors
+
+    def top(self, values, draw_info):
+        return self.height - (values - draw_info.min_val) * draw_info.block_height
+
+    def render(self, draw_info):
+        colors = self.column_colors(draw_info)
+        rows = self.rows[None, :]
+        out = self.buffer[self.x0:self.x1]
+
+        if self.buckets:
+            buckets = self.buckets
+            body = rows >= self.top(buckets.mins, draw_info)[:, None]
+            spread = rows >= self.top(buckets.maxs, draw_info)[:, None]
+            out[...] = np.where(body, colors[:, None], spread * np.uint8(RANGE_SLOT))
+            out[rows == self.top(buckets.last, draw_info)[:, None]] = LAST_SLOT
+        else:
+            bars = rows >= self.top(self.heights[self.index], draw_info)[:, None]
+            np.multiply(bars, colors[:, None], out=out, casting="unsafe")
+
+        pygame.surfarray.blit_array(self.surface, self.buffer)
+
+
+def draw_list_numpy(window, draw_info, full=False):
+    # numpy counterpart of draw_list, the whole bar area of the panel is
+    # rasterized and blitted at once but only when something changed
+    raster = draw_info.raster
+    if full or raster is None or not raster.matches(draw_info):
+        raster = draw_info.raster = BarRaster(draw_info)
+    elif draw_info.dirty or draw_info.highlights or draw_info.drawn_highlights \
+            or draw_info.mark_range != draw_info.drawn_mark:
+        raster.update(draw_info.lst, draw_info.dirty)
+    else:
+        return None
+
+    raster.render(draw_info)
+    x_offset, y_offset = draw_info.position
+    position = (x_offset, y_offset + draw_info.TITLE_HEIGHT)
+    window.blit(raster.surface, position)
+    return pygame.Rect(position, raster.surface.get_size())
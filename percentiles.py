@@ -0,0 +1,8 @@
+import math
+
+
+def percentile(values, q):
+    # nearest-rank percentile, the smallest value with at least q percent of
+    # the values at or below it
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
@@ -0,0 +1,96 @@
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+from percentiles import percentile
+
+
+class Section:
+    # times one block of a frame, reusable so timing allocates nothing
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+
+class FrameProfiler:
+    # per frame timings of the main loop sections, the last `window` frames
+    # of every section are kept for the percentiles
+
+    def __init__(self, target_fps=60, window=600):
+        self.frame_budget = 1 / target_fps
+        self.window = window
+        self.sections = {}
+        self.current = {}  # seconds per section in the running frame
+        self.samples = {}
+        self.frames = 0
+        self.dropped = 0
+        self.recent = {}
+        self.recent_time = 0.0
+
+    def time(self, name):
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+        return section
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self, frame_time):
+        # frame_time is the wall-clock time since the previous frame, a frame
+        # that took half again as long as the budget counts as dropped
+        self.frames += 1
+        if frame_time > 1.5 * self.frame_budget:
+            self.dropped += 1
+        self.add("frame", frame_time)
+
+        for name, seconds in self.current.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+        self.current = {}
+
+    def stats(self):
+        # milliseconds per section
+        return {
+            name: {
+                "p50": round(1000 * percentile(samples, 50), 3),
+                "p95": round(1000 * percentile(samples, 95), 3),
+                "p99": round(1000 * percentile(samples, 99), 3),
+                "max": round(1000 * max(samples), 3),
+            }
+            for name, samples in self.samples.items() if samples
+        }
+
+    def recent_stats(self, max_age=0.5):
+        # stats recomputed at most every max_age seconds, for the hud
+        now = time.perf_counter()
+        if now - self.recent_time >= max_age:
+            self.recent = self.stats()
+            self.recent_time = now
+        return self.recent
+
+    def summary(self):
+        return {"frames": self.frames, "dropped": self.dropped, "window": self.window, "sections": self.stats()}
+
+    def dump(self, path):
+        with open(path, "w") as out:
+            json.dump(self.summary(), out, indent=2)
+            out.write("\n")
+
+
+def timed(profiler, name):
+    # section of the profiler, or nothing when there is none
+    return profiler.time(name) if profiler else nullcontext()
@@ -0,0 +1,162 @@
+import numpy as np
+
+
+def is_sorted(lst):
+    return all(lst[i] <= lst[i + 1] for i in range(len(lst) - 1))
+
+
+class Sortedness:
+    # how far a list is from sorted, kept up to date from the indices that
+    # were written since the last update: adjacent descents in O(1) per
+    # index, so runs and the sorted check are free, and inversions through a
+    # fenwick tree over blocks of positions whose nodes hold a count per
+    # value, O(V log n) per index for V distinct values. inversions are
+    # only counted when asked for, the sorted check needs the descents alone
+
+    CHANGES = 16  # written indices that are always updated one by one
+    BLOCK = 64  # positions per leaf of the fenwick tree
+    VALUE_LIMIT = 1024  # wider value ranges leave the inversions out
+
+    def __init__(self, lst, inversions=False):
+        self.counting = inversions
+        self.rebuild(lst)
+
+    def rebuild(self, lst):
+        array = np.asarray(lst, dtype=np.int64)
+        descending = array[:-1] > array[1:]
+        self.values = array.tolist()
+        self.descending = bytearray(descending.tobytes())
+        self.descents = int(descending.sum())
+
+        self.tree = None
+        self.inversions = None
+        n = len(array)
+        if not self.counting or not n:
+            self.inversions = 0 if self.counting else None
+            return
+        self.low = int(array.min())
+        span = int(array.max()) - self.low + 1
+        if span > self.VALUE_LIMIT:
+            return
+        # value counts per block, their fenwick sums and the whole list's counts
+        ranks = array - self.low
+        blocks = -(-n // self.BLOCK)
+        self.span = span
+        counts = np.bincount(np.arange(n) // self.BLOCK * span + ranks, minlength=blocks * span)
+        self.blocks = counts.reshape(blocks, span)
+        self.totals = self.blocks.sum(axis=0)
+        tree = np.zeros((blocks + 1, span), dtype=np.int64)
+        tree[1:] = self.blocks
+        for k in range(1, blocks + 1):
+            parent = k + (k & -k)
+            if parent <= blocks:
+                tree[parent] += tree[k]
+        self.tree = tree
+
+        # inversions between blocks from the counts of the blocks ahead,
+        # inside a block by comparing every pair. padding with a value above
+        # all the others adds no pairs
+        ahead = np.cumsum(self.blocks, axis=0) - self.blocks
+        larger = np.cumsum(ahead[:, ::-1], axis=1)[:, -2::-1]
+        rows = np.full(blocks * self.BLOCK, span, dtype=np.int16)
+        rows[:n] = ranks
+        rows = rows.reshape(blocks, self.BLOCK)
+        pairs = np.triu(np.ones((self.BLOCK, self.BLOCK), dtype=bool), 1)
+        self.inversions = (int((self.blocks[:, :-1] * larger).sum())
+                           + int(np.count_nonzero((rows[:, :, None] > rows[:, None, :]) & pairs)))
+
+    def before(self, block):
+        # value counts of all the blocks ahead of block
+        nodes = []
+        while block > 0:
+            nodes.append(block)
+            block -= block & -block
+        return self.tree[nodes].sum(axis=0)
+
+    def move(self, i, old, new):
+        # inversions gained by lst[i] going from old to new, then the counts
+        lo, hi = (old, new) if old < new else (new, old)
+        block = i // self.BLOCK
+        start = block * self.BLOCK
+        values = self.values
+        # going up, the elements ahead in (lo, hi] stop being larger and the
+        # ones behind in [lo, hi) start being smaller, going down the reverse.
+        # whole blocks come from the counts, the block of i is looked through
+        r_lo, r_hi = lo - self.low, hi - self.low
+        ahead = self.before(block)
+        behind = self.totals - ahead - self.blocks[block]
+        gained = (int(behind[r_lo:r_hi].sum()) - int(ahead[r_lo + 1:r_hi + 1].sum())
+                  + sum(lo <= v < hi for v in values[i + 1:start + self.BLOCK])
+                  - sum(lo < v <= hi for v in values[start:i]))
+        self.inversions += gained if new > old else -gained
+
+        o, w = old - self.low, new - self.low
+        self.blocks[block, o] -= 1
+        self.blocks[block, w] += 1
+        self.totals[o] -= 1
+        self.totals[w] += 1
+        k = block + 1
+        tree = self.tree
+        while k < len(tree):
+            tree[k, o] -= 1
+            tree[k, w] += 1
+            k += k & -k
+
+    def update(self, lst, indices):
+        # past one index in 128 recounting is faster, a value outside the
+        # counted range needs a recount as well
+        values = self.values
+        n = len(values)
+        if len(lst) != n or len(indices) > max(self.CHANGES, n // 128):
+            self.rebuild(lst)
+            return
+
+        descending = self.descending
+        tree = self.tree
+        for i in indices:
+            new, old = int(lst[i]), values[i]
+            if new == old:
+                continue
+            if tree is not None:
+                if not 0 <= new - self.low < self.span:
+                    self.rebuild(lst)
+                    return
+                self.move(i, old, new)
+            values[i] = new
+            if i > 0:
+                d = values[i - 1] > new
+                if d != descending[i - 1]:
+                    descending[i - 1] = d
+                    self.descents += 1 if d else -1
+            if i < n - 1:
+                d = new > values[i + 1]
+                if d != descending[i]:
+                    descending[i] = d
+                    self.descents += 1 if d else -1
+
+    @property
+    def is_sorted(self):
+        return self.descents == 0
+
+    @property
+    def runs(self):
+        # maximal non-decreasing stretches
+        return self.descents + 1 if len(self.values) else 0
+
+    @property
+    def sorted_prefix(self):
+        # length of the longest sorted stretch at the start
+        if not self.descents:
+            return len(self.values)
+        return self.descending.find(1) + 1
+
+    @property
+    def disorder(self):
+        # 0 for a sorted list up to 1 for a reversed one, by inversions when
+        # they are counted and by descents otherwise
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        if self.inversions is not None:
+            return self.inversions / (n * (n - 1) // 2)
+        return self.descents / (n - 1)
@@ -0,0 +1,33 @@
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+import visualizer  # noqa: E402
+from algorithms import stalin_sort  # noqa: E402
+
+
+def run_stalin(renderer, n):
+    # one step per frame so every highlight a delete leaves behind is drawn,
+    # the list is longer than the panel is wide so it is decimated
+    window = pygame.display.set_mode((1920, 980))
+    random.seed(3)
+    lst = visualizer.generate_starting_list(n, 5, 100, 3)
+    info = visualizer.layout_panels(window, lst, ["Stalin Sort"], renderer)[0]
+    info.start(stalin_sort)
+    while info.steps is not None:
+        info.advance(1)
+        visualizer.draw_algo(window, info)
+    return info
+
+
+def test_draw_columns_survives_deletes_at_the_end():
+    info = run_stalin("rect", 500)
+    assert info.decimated and info.sorting_complete
+
+
+def test_draw_list_numpy_survives_deletes_at_the_end():
+    info = run_stalin("numpy", 1000)
+    assert info.sorting_complete
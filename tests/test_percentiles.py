@@ -0,0 +1,10 @@
+from percentiles import percentile
+
+
+def test_nearest_rank():
+    assert percentile(range(1, 21), 95) == 19
+    assert percentile(range(1, 11), 50) == 5
+    assert percentile(range(1, 101), 95) == 95
+    assert percentile(range(1, 101), 99) == 99
+    assert percentile([3, 1, 2], 100) == 3
+    assert percentile([7], 0) == 7
@@ -0,0 +1,29 @@
+import math
+from array import array
+
+from algorithms import quick_sort
+from distributions import generate
+from engine import OpCounters, run_headless
+
+N = 10000
+
+
+def comparisons(values):
+    lst = array("i", values)
+    counters = OpCounters()
+    assert run_headless(quick_sort, lst, counters)
+    assert list(lst) == sorted(values)
+    return counters.comparisons
+
+
+def test_presorted_input_stays_n_log_n():
+    # sorted and reversed input used to pick the worst pivots over and over
+    limit = 1.5 * N * math.log2(N)
+    assert comparisons(list(range(N))) < limit
+    assert comparisons(list(range(N, 0, -1))) < limit
+    assert comparisons(generate("ascending", N, 5, 100, 0)) < limit
+    assert comparisons(generate("descending", N, 5, 100, 0)) < limit
+
+
+def test_equal_input_is_linear():
+    assert comparisons([7] * N) < 2 * N
@@ -0,0 +1,25 @@
+from algorithms import bubble_sort
+from distributions import generate
+from engine import SortState
+from timeline import Timeline
+
+
+def run(budget):
+    state = SortState(generate("uniform", 120, 5, 100, 2))
+    timeline = Timeline(state, bubble_sort, interval=64)
+    state.start(timeline.start)
+    while state.steps is not None:
+        state.advance(budget)
+    return state, timeline
+
+
+def test_keyframes_hold_the_counts_of_the_current_budget():
+    # a keyframe taken halfway through a budget has to include the
+    # operations applied so far in it
+    reference, _ = run(1)
+    state, timeline = run(997)
+    timeline.seek(timeline.positions[len(timeline.positions) // 2] + 5)
+    while state.steps is not None:
+        state.advance(997)
+    assert state.counters.as_dict() == reference.counters.as_dict()
+    assert state.elapsed == reference.elapsed
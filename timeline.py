@@ -0,0 +1,118 @@
+from array import array
+from bisect import bisect_right
+
+from engine import KEYFRAME, apply_ops
+
+
+class Timeline:
+    # history of one panel: every operation the algorithm yielded plus a full
+    # snapshot of the panel every `interval` operations, so any past step is
+    # one snapshot and at most `interval` operations away
+
+    INTERVAL = 1024
+    BUDGET = 8 * 1024 * 1024  # bytes of snapshots and log kept per panel
+
+    def __init__(self, state, algorithm, interval=INTERVAL, budget=BUDGET):
+        self.state = state
+        self.algorithm = algorithm
+        self.interval = interval
+        self.budget = budget
+
+    def start(self, lst):
+        # used in place of the algorithm, wraps its generator
+        self.live = self.algorithm(lst)
+        self.log = array("i")  # three ints per operation
+        self.first = 0  # operation stored at the start of the log
+        self.head = 0  # operations pulled from the algorithm so far
+        self.position = 0  # operations the panel has applied
+        self.keyframes = []  # (position, list, highlights, mark, counters, elapsed) by position
+        self.positions = []
+        return self.steps()
+
+    def steps(self):
+        # replays the log up to the head, then keeps pulling from the
+        # algorithm. the answer to a replayed CHECK only matters for the last
+        # one, the algorithm is still waiting for that
+        log = self.log
+        answer = None
+        while self.position < self.head:
+            k = 3 * (self.position - self.first)
+            self.position += 1
+            answer = yield log[k], log[k + 1], log[k + 2]
+
+        head = self.head
+        live = self.live
+        while True:
+            try:
+                op = live.send(answer)
+            except StopIteration:
+                return
+            if head % self.interval == 0 and (not self.positions or self.positions[-1] < head):
+                # the driver counts in locals, it catches up on KEYFRAME
+                yield KEYFRAME,
+                self.snapshot()
+            log.extend(op)
+            if len(op) < 3:
+                log.extend((0, 0)[len(op) - 1:])
+            head += 1
+            self.head = self.position = head
+            answer = yield op
+
+    @property
+    def earliest(self):
+        return self.positions[0] if self.positions else 0
+
+    def memory(self):
+        # the op log plus the list and highlights every snapshot holds
+        return self.log.itemsize * len(self.log) + sum(4 * len(kf[1]) + kf[2].nbytes() for kf in self.keyframes)
+
+    def snapshot(self):
+        state = self.state
+        self.keyframes.append((self.head, array("i", state.lst), state.highlights.copy(), state.mark_range,
+                               state.counters.copy(), state.elapsed))
+        self.positions.append(self.head)
+        if self.memory() > self.budget:
+            self.evict()
+
+    def evict(self):
+        # thin the snapshots out first, every other one goes and new ones are
+        # taken half as often, once the log alone is too big the oldest
+        # history is dropped
+        while self.memory() > self.budget and len(self.keyframes) > 2:
+            self.keyframes = self.keyframes[::2]
+            self.positions = self.positions[::2]
+            self.interval *= 2
+
+        while self.memory() > self.budget and len(self.keyframes) > 1:
+            del self.keyframes[0], self.positions[0]
+            del self.log[:3 * (self.positions[0] - self.first)]
+            self.first = self.positions[0]
+
+    def seek(self, target):
+        # show the panel as it was after `target` operations, the run picks
+        # up again from there, replaying the log until it reaches the head
+        target = max(self.earliest, min(target, self.head))
+        state = self.state
+        if not self.keyframes or target == self.position:
+            return
+
+        if not self.position <= target < self.position + self.interval:
+            k = bisect_right(self.positions, target) - 1
+            position, values, highlights, mark, counters, elapsed = self.keyframes[k]
+            state.lst[:] = values
+            state.highlights = highlights.copy()
+            state.mark_range = mark
+            state.counters = counters.copy()
+            state.elapsed = elapsed
+            self.position = position
+
+        ops = self.log[3 * (self.position - self.first):3 * (target - self.first)]
+        it = iter(ops)
+        apply_ops(state, zip(it, it, it))
+        self.position = target
+
+        state.steps = self.steps()
+        state.waiting = 0
+        state.sorting_complete = False
+        state.dirty.clear()
+        state.needs_redraw = True
@@ -0,0 +1,121 @@
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+from algorithms import ALL_ALGORITHMS
+from datasets import Dataset
+from distributions import generate
+from engine import SWAP, WRITE, DELETE, CHECK
+from sortedness import is_sorted
+
+# a trace is a fixed header, the initial list as int32 and then one record of
+# three int32 (op, a, b) per operation, little-endian. records are only ever
+# appended and their count follows from the file size, so a cut off file
+# still replays up to its last whole record
+MAGIC = b"SORTTRC1"
+HEADER = struct.Struct("<8sI32s")  # magic, list length, algorithm name
+RECORD_SIZE = 12
+FLUSH_RECORDS = 65536  # records buffered before they are written out
+
+
+def native_order(values):
+    # array in file byte order
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def record(algorithm, lst, path, name=""):
+    # run the algorithm to completion on lst and write every operation it
+    # yields, returns the number of records
+    count = 0
+    with open(path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, len(lst), name.encode()[:32]))
+        out.write(native_order(array("i", lst)).tobytes())
+
+        buffer = array("i")
+        generator = algorithm(lst)
+        answer = None
+        while True:
+            try:
+                op = generator.send(answer)
+            except StopIteration:
+                break
+            answer = None
+
+            code = op[0]
+            if code == CHECK:
+                answer = is_sorted(lst)
+            elif code == SWAP:
+                i, j = op[1], op[2]
+                lst[i], lst[j] = lst[j], lst[i]
+            elif code == WRITE:
+                lst[op[1]] = op[2]
+            elif code == DELETE:
+                del lst[op[1]]
+
+            buffer.append(code)
+            buffer.append(op[1] if len(op) > 1 else 0)
+            buffer.append(op[2] if len(op) > 2 else 0)
+            count += 1
+            if len(buffer) >= 3 * FLUSH_RECORDS:
+                out.write(native_order(buffer).tobytes())
+                buffer = array("i")
+
+        out.write(native_order(buffer).tobytes())
+    return count
+
+
+class Trace:
+    # a recorded run read through mmap, nothing but the header and the
+    # initial list is loaded up front
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.length, name = HEADER.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a sort trace")
+        self.name = name.rstrip(b"\0").decode()
+        self.start = HEADER.size + 4 * self.length
+        self.count = (len(self.map) - self.start) // RECORD_SIZE
+
+    def initial_list(self):
+        values = array("i")
+        values.frombytes(self.map[HEADER.size:self.start])
+        return native_order(values)
+
+    def steps(self, lst):
+        # generator with the same signature as the algorithms, yields the
+        # recorded operations straight out of the mapped file
+        end = self.start + self.count * RECORD_SIZE
+        if sys.byteorder != "little":
+            records = array("i")
+            records.frombytes(self.map[self.start:end])
+            yield from self.records(native_order(records))
+            return
+
+        with memoryview(self.map) as view, view[self.start:end] as data, data.cast("i") as records:
+            yield from self.records(records)
+
+    def records(self, records):
+        for k in range(0, 3 * self.count, 3):
+            yield records[k], records[k + 1], records[k + 2]
+
+    def close(self):
+        self.map.close()
+
+
+def main(args):
+    name, algorithm = next((name, fn) for name, fn in ALL_ALGORITHMS if fn.__name__ == args.algorithm)
+    if args.data:
+        lst = Dataset(args.data, args.data_format, args.column).sample(args.size, 5, 100)
+    else:
+        lst = generate(args.distribution, args.size, 5, 100, args.seed)
+    n = len(lst)  # record sorts lst in place, stalin sort shortens it
+    random.seed(args.seed)  # the joke sorts draw from the global generator
+    count = record(algorithm, lst, args.record, name)
+    print(f"{name} n={n}: {count} operations written to {args.record}", file=sys.stderr)
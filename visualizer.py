@@ -0,0 +1,719 @@
+from array import array
+from collections import OrderedDict
+import pygame
+import math
+import time
+import pygame_widgets
+from pygame_widgets.slider import Slider
+
+from algorithms import BANKS
+from decimate import ColumnBuckets
+from distributions import DISTRIBUTIONS, generate
+from engine import Scheduler, SortState
+from numpy_renderer import draw_list_numpy
+from profiler import FrameProfiler, timed
+from timeline import Timeline
+
+pygame.init()
+
+# slider range (min, max, step) and initial list size for every renderer,
+# the numpy renderer rasterizes whole panels so it handles far larger lists
+LIST_SIZES = {
+    "rect": (10, 500, 10, 100),
+    "numpy": (1000, 100000, 1000, 10000),
+}
+
+
+class DrawInformation(SortState):
+    BLACK = 0, 0, 0
+    WHITE = 255, 255, 255
+    GREEN = 0, 255, 0
+    RED = 255, 0, 0
+    BLUE = 0, 0, 255
+    PURPLE = 128, 0, 128
+    BACKGROUND_COLOR = (30, 30, 30)  # dark mode background
+
+    RANGE_COLOR = 70, 70, 70  # spread between min and max of a decimated column
+    LAST_COLOR = 210, 210, 210  # last touched value of a decimated column
+
+    # indexed by the highlight colour codes of the engine
+    HIGHLIGHT_COLORS = (RED, GREEN, BLUE, PURPLE)
+
+    GRADIENTS = [
+        (100, 100, 100),  # darker gradients for dark mode
+        (130, 130, 130),
+        (160, 160, 160)
+    ]
+
+    FONT = pygame.font.SysFont('jetbrains-mono', 30)
+    LARGE_FONT = pygame.font.SysFont('jetbrains-mono', 40)
+    SMALL_FONT = pygame.font.SysFont('jetbrains-mono', 20)
+
+    SIDE_PAD = 100
+    TOP_PAD = 150
+    TITLE_HEIGHT = 50  # band above the bars that holds the title
+
+    def __init__(self, width, height, lst, position=(0, 0), scale=1.0, renderer="rect"):
+        self.width = width
+        self.height = height
+        self.position = position
+        self.scale = scale
+        self.renderer = renderer
+        self.window = None  # will be set by the main window
+        self.timeline = None  # history of the run, when it is kept
+        self.set_list(lst[:])
+        self.algo_name = ""
+
+    def set_list(self, lst, value_range=None):
+        # value_range saves scanning the list when it is already known
+        self.reset(lst)
+        # what is currently on screen, to find the bars that need a redraw
+        self.drawn_title = None
+        self.drawn_highlights = set()
+        self.drawn_mark = None
+        self.raster = None  # bar buffer of the numpy renderer
+        self.buckets = None  # column summaries of a decimated list
+        if value_range is None:
+            value_range = (min(lst), max(lst)) if lst else (0, 1)
+        self.min_val, self.max_val = value_range
+
+        # dynamic adjustment of block width based on list length
+        self.block_width = round((self.width - self.SIDE_PAD) / max(1, len(lst)))
+        self.block_height = math.floor((self.height - self.TOP_PAD) / max(1, (self.max_val - self.min_val)))
+        self.start_x = self.SIDE_PAD // 2
+
+        # lists longer than the panel is wide are drawn one pixel column per
+        # bucket of elements
+        self.columns = max(1, self.width - self.SIDE_PAD)
+        self.decimated = len(lst) > self.columns
+
+        # wall-clock operation rate shown by the stats overlay
+        self.rate_ops = 0
+        self.rate_time = time.perf_counter()
+        self.ops_per_second = 0.0
+
+    def changed_indices(self):
+        # written bars plus everything whose highlight changed since the last frame
+        indices = set(self.dirty)
+        indices.update(self.drawn_highlights)
+        indices.update(self.highlights)
+        if self.mark_range != self.drawn_mark:
+            for mark in (self.mark_range, self.drawn_mark):
+                if mark:
+                    indices.update(range(mark[0], mark[1] + 1))
+        return indices
+
+
+class TextCache:
+    # rendered text surfaces keyed by font, text and colour, the least
+    # recently used ones are dropped once the cache is full
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = font.render(text, 1, color)
+            if len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+TEXT_CACHE = TextCache()
+
+
+def draw(window, algo_infos, slider=None, scheduler=None, redraw_all=False, stats=False, profiler=None):
+    # only the parts of the window that changed are redrawn, the returned
+    # rects are meant for pygame.display.update
+    if redraw_all:
+        window.fill(DrawInformation.BACKGROUND_COLOR)
+        for info in algo_infos:
+            info.needs_redraw = True
+
+    rects = []
+
+    # draw the visualization for each algorithm
+    for info in algo_infos:
+        with timed(profiler, f"draw {info.algo_name}"):
+            rect = draw_algo(window, info, stats, profiler)
+        if rect:
+            rects.append(rect)
+
+    # the controls strip at the bottom is small, so it is redrawn every frame
+    width, height = window.get_size()
+    controls_rect = pygame.Rect(0, height - 60, width, 60)
+    window.fill(DrawInformation.BACKGROUND_COLOR, controls_rect)
+    rects.append(controls_rect)
+
+    # draw control text over two lines, the speed and status follow the
+    # second one so nothing ends up under the slider on the right
+    controls_font = DrawInformation.SMALL_FONT
+    line_y = height - 30
+    with timed(profiler, "text"):
+        first = TEXT_CACHE.render(controls_font, "R - Reset | UP/DOWN - List Size | -/+ - Speed | "
+                                                 "SPACE - Pause | S - Step | F - Finish",
+                                  DrawInformation.WHITE)
+        second = TEXT_CACHE.render(controls_font, "D - Distribution | LEFT/RIGHT - Scrub | B - Bank | "
+                                                  "I - Stats | P - Profiler",
+                                   DrawInformation.WHITE)
+    window.blit(first, (10, line_y - controls_font.get_linesize()))
+    window.blit(second, (10, line_y))
+
+    # draw the slider and information about list size
+    if slider:
+        slider.draw()
+        with timed(profiler, "text"):
+            size_text = TEXT_CACHE.render(controls_font, f"List Size: {int(slider.getValue())}",
+                                          DrawInformation.WHITE)
+        window.blit(size_text, (slider.getX() + slider.getWidth() + 10, slider.getY() + 5))
+
+    # draw the current speed
+    if scheduler:
+        status = " (Paused)" if scheduler.paused else ""
+        behind = max((info.timeline.head - info.timeline.position for info in algo_infos if info.timeline),
+                     default=0)
+        if behind:
+            status += f" | {behind} ops behind"
+        with timed(profiler, "text"):
+            speed_text = TEXT_CACHE.render(controls_font, f"Speed: {scheduler.speed:g}x{status}",
+                                           DrawInformation.WHITE)
+        window.blit(speed_text, (10 + second.get_width() + 40, line_y))
+
+    if redraw_all:
+        return [window.get_rect()]
+    return rects
+
+
+def draw_algo(window, draw_info, stats=False, profiler=None):
+    x_offset, y_offset = draw_info.position
+    panel_rect = pygame.Rect(x_offset, y_offset, draw_info.width, draw_info.height)
+    full = draw_info.needs_redraw
+    rects = []
+
+    # keep oversized lists from bleeding into the neighbouring panels
+    window.set_clip(panel_rect)
+
+    if full:
+        window.fill(draw_info.BACKGROUND_COLOR, panel_rect)
+
+    # draw algorithm name and status when it changed
+    algo_name = draw_info.algo_name
+    status = "Complete" if draw_info.sorting_complete else "Sorting..."
+    title_text = f"{algo_name} - {status}"
+    if full or title_text != draw_info.drawn_title:
+        with timed(profiler, "text"):
+            title = TEXT_CACHE.render(draw_info.FONT, title_text,
+                                      draw_info.GREEN if draw_info.sorting_complete else draw_info.RED)
+        title_rect = pygame.Rect(x_offset, y_offset, draw_info.width, draw_info.TITLE_HEIGHT)
+        window.fill(draw_info.BACKGROUND_COLOR, title_rect)
+        window.blit(title, (x_offset + draw_info.width / 2 - title.get_width() / 2, y_offset + 5))
+        draw_info.drawn_title = title_text
+        rects.append(title_rect)
+
+    # draw the list, or only the bars that changed since the last frame
+    if draw_info.renderer == "numpy":
+        rect = draw_list_numpy(window, draw_info, full)
+        if rect:
+            rects.append(rect)
+    elif draw_info.decimated:
+        rect = draw_columns(window, draw_info, full)
+        if rect:
+            rects.append(rect)
+    elif full:
+        draw_list(window, draw_info)
+        rects = [panel_rect]
+    else:
+        rect = draw_list(window, draw_info, draw_info.changed_indices())
+        if rect:
+            rects.append(rect)
+
+    # the counters change every frame, so the overlay goes on top of the bars
+    if stats:
+        with timed(profiler, "text"):
+            rects.append(draw_stats(window, draw_info))
+
+    # the overlay brought the tracker up to date, without it the tracker is
+    # dropped and made again by the next sorted check that needs it
+    if not stats:
+        draw_info.sortedness = None
+    draw_info.dirty.clear()
+    draw_info.drawn_highlights = set(draw_info.highlights)
+    draw_info.drawn_mark = draw_info.mark_range
+    draw_info.needs_redraw = False
+    window.set_clip(None)
+
+    if rects:
+        return rects[0].unionall(rects[1:])
+    return None
+
+
+def draw_stats(window, draw_info):
+    # counters of the run below the title, they change every frame so the
+    # text is rendered directly instead of going through the text cache
+    x_offset, y_offset = draw_info.position
+    counters = draw_info.counters
+
+    now = time.perf_counter()
+    ops = counters.comparisons + counters.swaps + counters.writes + counters.deletes
+    if ops < draw_info.rate_ops:
+        draw_info.rate_ops = 0  # restarted
+    if now - draw_info.rate_time >= 0.5:
+        draw_info.ops_per_second = (ops - draw_info.rate_ops) / (now - draw_info.rate_time)
+        draw_info.rate_ops = ops
+        draw_info.rate_time = now
+
+    operations = f"comparisons {counters.comparisons:,}  swaps {counters.swaps:,}  writes {counters.writes:,}"
+    if counters.deletes:
+        operations += f"  deletes {counters.deletes:,}"
+    lines = [
+        operations,
+        f"peak aux {counters.peak_aux:,}  time {draw_info.elapsed / Scheduler.BASE_RATE:.1f}s  "
+        f"{draw_info.ops_per_second:,.0f} ops/s",
+    ]
+    if counters.disk_reads or counters.disk_writes:
+        # an external sort moves 8-byte elements to and from disk
+        lines.append(f"runs {counters.sorted_runs}  passes {counters.merge_passes}  "
+                     f"read {8 * counters.disk_reads:,} B  written {8 * counters.disk_writes:,} B")
+
+    # how far from sorted the list is
+    sortedness = draw_info.measure(inversions=True)
+    if sortedness.inversions is None:
+        inversions = f"inversions not counted over {sortedness.VALUE_LIMIT:,} values  "
+    else:
+        inversions = f"inversions {sortedness.inversions:,}  "
+    lines.append(f"{inversions}runs {sortedness.runs:,}  sorted prefix {sortedness.sorted_prefix:,}")
+
+    font = draw_info.SMALL_FONT
+    line_height = font.get_linesize()
+    gauge_height = 6
+    stats_rect = pygame.Rect(x_offset, y_offset + draw_info.TITLE_HEIGHT, draw_info.width,
+                             len(lines) * line_height + gauge_height)
+    window.fill(draw_info.BACKGROUND_COLOR, stats_rect)
+    for k, line in enumerate(lines):
+        text = font.render(line, 1, draw_info.WHITE)
+        window.blit(text, (x_offset + draw_info.width / 2 - text.get_width() / 2, stats_rect.y + k * line_height))
+
+    # disorder gauge, the green part is the sorted share
+    gauge = pygame.Rect(x_offset + draw_info.SIDE_PAD // 2, stats_rect.bottom - gauge_height,
+                        draw_info.width - draw_info.SIDE_PAD, gauge_height - 2)
+    window.fill(draw_info.RANGE_COLOR, gauge)
+    window.fill(draw_info.GREEN, (gauge.x, gauge.y, round(gauge.width * (1 - sortedness.disorder)), gauge.height))
+    return stats_rect
+
+
+def draw_profiler(window, profiler):
+    # frame time percentiles in the top left corner, drawn over the panels
+    stats = profiler.recent_stats()
+    names = ["frame", "work", "events", "widgets", "input", "sort", "draw", "text", "display"]
+    panels = [name for name in stats if name.startswith("draw ")]
+    if panels:
+        names.append(max(panels, key=lambda name: stats[name]["p95"]))
+
+    lines = ["section: p50 / p95 / p99 ms"]
+    for name in names:
+        if name in stats:
+            s = stats[name]
+            lines.append(f"{name}: {s['p50']:.2f} / {s['p95']:.2f} / {s['p99']:.2f}")
+    lines.append(f"dropped {profiler.dropped} of {profiler.frames} frames")
+
+    font = DrawInformation.SMALL_FONT
+    line_height = font.get_linesize()
+    texts = [font.render(line, 1, DrawInformation.WHITE) for line in lines]
+    hud_rect = pygame.Rect(20, 20, max(text.get_width() for text in texts) + 20, len(texts) * line_height + 20)
+    window.fill(DrawInformation.BLACK, hud_rect)
+    for k, text in enumerate(texts):
+        window.blit(text, (hud_rect.x + 10, hud_rect.y + 10 + k * line_height))
+    return hud_rect
+
+
+def draw_list(window, draw_info, indices=None):
+    # with indices only those bars are cleared and redrawn, the bounding
+    # rect of everything that was drawn is returned
+    lst = draw_info.lst
+    x_offset, y_offset = draw_info.position
+    mark_lo, mark_hi = draw_info.mark_range or (0, -1)
+    bottom = y_offset + draw_info.height
+    top = bottom - (draw_info.max_val - draw_info.min_val) * draw_info.block_height
+
+    if indices is None:
+        indices = range(len(lst))
+        clear = False
+    else:
+        indices = [i for i in indices if i < len(lst)]
+        clear = True
+
+    if not indices:
+        return None
+
+    for i in indices:
+        val = lst[i]
+        x = draw_info.start_x + i * draw_info.block_width + x_offset
+        y = bottom - (val - draw_info.min_val) * draw_info.block_height
+
+        color = draw_info.GRADIENTS[i % 3]
+
+        if mark_lo <= i <= mark_hi:
+            color = draw_info.PURPLE
+
+        if clear:
+            window.fill(draw_info.BACKGROUND_COLOR, (x, top, draw_info.block_width, bottom - top))
+        pygame.draw.rect(window, color, (x, y, draw_info.block_width, bottom - y))
+
+    # the highlighted bars go over the plain ones, they are always among the
+    # redrawn indices
+    for i, color in draw_info.highlights.items():
+        if i < len(lst):
+            x = draw_info.start_x + i * draw_info.block_width + x_offset
+            y = bottom - (lst[i] - draw_info.min_val) * draw_info.block_height
+            pygame.draw.rect(window, draw_info.HIGHLIGHT_COLORS[color], (x, y, draw_info.block_width, bottom - y))
+
+    left = draw_info.start_x + min(indices) * draw_info.block_width + x_offset
+    right = draw_info.start_x + (max(indices) + 1) * draw_info.block_width + x_offset
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def draw_columns(window, draw_info, full=False):
+    # decimated counterpart of draw_list, every pixel column shows the min of
+    # its bucket as the bar, the spread up to the max and the last touched
+    # value, only the columns that changed are redrawn
+    buckets = draw_info.buckets
+    mark = draw_info.mark_range
+    if full or buckets is None:
+        buckets = draw_info.buckets = ColumnBuckets(draw_info.lst, draw_info.columns)
+        columns = range(buckets.columns)
+        clear = False
+    else:
+        changed = set(buckets.update(draw_info.lst, draw_info.dirty).tolist())
+        # a delete can leave a highlight one past the end of the list
+        n = len(draw_info.lst)
+        highlighted = [i for i in draw_info.drawn_highlights.union(draw_info.highlights) if i < n]
+        if highlighted:
+            changed.update(buckets.bucket_of(highlighted).tolist())
+        if mark != draw_info.drawn_mark:
+            for rng in (mark, draw_info.drawn_mark):
+                if rng:
+                    changed.update(buckets.buckets_between(*rng).tolist())
+        columns = sorted(changed)
+        clear = True
+
+    if not columns:
+        return None
+
+    # colour of the highlighted and marked buckets
+    highlights = {}
+    pairs = [(i, color) for i, color in draw_info.highlights.items() if i < len(draw_info.lst)]
+    if pairs:
+        positions, colors = zip(*pairs)
+        for b, color in zip(buckets.bucket_of(list(positions)).tolist(), colors):
+            highlights[b] = draw_info.HIGHLIGHT_COLORS[color]
+    mark_lo, mark_hi = (buckets.bucket_of(mark[0]), buckets.bucket_of(mark[1])) if mark else (0, -1)
+
+    x_offset, y_offset = draw_info.position
+    bottom = y_offset + draw_info.height
+    top = bottom - (draw_info.max_val - draw_info.min_val) * draw_info.block_height
+    mins, maxs, last = buckets.mins.tolist(), buckets.maxs.tolist(), buckets.last.tolist()
+
+    for b in columns:
+        x = draw_info.start_x + b + x_offset
+        y_min = bottom - (mins[b] - draw_info.min_val) * draw_info.block_height
+        y_max = bottom - (maxs[b] - draw_info.min_val) * draw_info.block_height
+        y_last = bottom - (last[b] - draw_info.min_val) * draw_info.block_height
+
+        color = draw_info.GRADIENTS[b % 3]
+
+        if mark_lo <= b <= mark_hi:
+            color = draw_info.PURPLE
+
+        if b in highlights:
+            color = highlights[b]
+
+        if clear:
+            window.fill(draw_info.BACKGROUND_COLOR, (x, top, 1, bottom - top))
+        window.fill(draw_info.RANGE_COLOR, (x, y_max, 1, y_min - y_max))
+        window.fill(color, (x, y_min, 1, bottom - y_min))
+        window.fill(draw_info.LAST_COLOR, (x, y_last, 1, 1))
+
+    left = draw_info.start_x + columns[0] + x_offset
+    return pygame.Rect(left, top, columns[-1] + 1 - columns[0], bottom - top)
+
+
+def layout_panels(window, lst, names, renderer="rect"):
+    # grid of algorithm visualizations filling the window above the controls
+    screen_width, screen_height = window.get_size()
+
+    # calculate grid layout for algorithms
+    rows, cols = 3, 4
+    algo_width = (screen_width - (cols + 1) * 20) // cols
+    algo_height = (screen_height - (rows + 1) * 20 - 50) // rows  # account for bottom controls
+
+    algo_infos = []
+
+    # create a grid of algorithm visualizations
+    for row in range(rows):
+        for col in range(cols):
+            x_pos = 20 + col * (algo_width + 20)
+            y_pos = 20 + row * (algo_height + 20)
+            algo_infos.append(DrawInformation(algo_width, algo_height, lst, position=(x_pos, y_pos),
+                                              renderer=renderer))
+
+    # set algorithm names
+    del algo_infos[len(names):]
+    for info, name in zip(algo_infos, names):
+        info.algo_name = name
+
+    # set window reference for all visualizations
+    for info in algo_infos:
+        info.window = window
+
+    return algo_infos
+
+
+def generate_starting_list(n, min_val, max_val, seed=None, distribution="uniform"):
+    # seeded lists are cached, going back to a list size is instant. panels
+    # keep their lists as 32-bit int arrays, copied from this one with a memcpy
+    return array("i", generate(distribution, n, min_val, max_val, seed))
+
+
+def start_panels(algo_infos, algorithms, scheduler):
+    # panels sorted in this process keep a timeline so they can be scrubbed
+    if scheduler.TIMELINES:
+        for info, algorithm in zip(algo_infos, algorithms):
+            info.timeline = Timeline(info, algorithm)
+        algorithms = [info.timeline.start for info in algo_infos]
+
+    scheduler.start(algo_infos, algorithms)
+
+
+def restart_sorting(algo_infos, original_list, scheduler, algorithms=BANKS[0]):
+    # every panel gets its own copy of the list, a slice of the array is a
+    # single memcpy, and the scheduler starts a fresh run of every algorithm
+    value_range = (min(original_list), max(original_list)) if original_list else None
+    for info in algo_infos:
+        info.set_list(original_list[:], value_range)
+
+    start_panels(algo_infos, [algorithm for _, algorithm in algorithms], scheduler)
+
+
+def restart_replays(algo_infos, traces, scheduler):
+    # every panel replays one recorded trace from its own initial list
+    for info, trace in zip(algo_infos, traces):
+        info.set_list(trace.initial_list())
+
+    start_panels(algo_infos, [trace.steps for trace in traces], scheduler)
+
+
+def scrub(algo_infos, scheduler, steps):
+    # move every panel the same number of operations back or forward in its
+    # timeline, the run stays paused so the frame can be looked at
+    if not scheduler.TIMELINES:
+        return
+    scheduler.paused = True
+    for info in algo_infos:
+        info.timeline.seek(info.timeline.position + steps)
+
+
+def main(renderer="rect", processes=False, traces=(), profile=None, bank=0, seed=0, distribution="uniform",
+         dataset=None):
+    # screen setup
+    width, height = 1920, 980  # height reduced from 1080 to 980
+    window = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+
+    def set_caption():
+        source = dataset.name if dataset else distribution.replace('_', ' ')
+        pygame.display.set_caption(f"Sorting Algorithms Visualization - {source}")
+
+    set_caption()
+
+    # initial list settings, R moves on to the next seed. a dataset is
+    # sampled down to the list size instead
+    min_size, max_size, size_step, n = LIST_SIZES[renderer]
+    min_val = 5
+    max_val = 100
+
+    def starting_list():
+        if dataset:
+            return array("i", dataset.sample(n, min_val, max_val))
+        return generate_starting_list(n, min_val, max_val, seed, distribution)
+
+    original_list = starting_list()
+
+    # create slider for list size control
+    list_size_slider = Slider(
+        window,
+        width - 300,
+        height - 50,
+        200,
+        20,
+        min=min_size,
+        max=max_size,
+        step=size_step,
+        initial=n
+    )
+
+    # configure algorithm visualizations with grid layout
+    def update_algo_infos():
+        # replays only use as many panels as there are traces
+        names = [trace.name for trace in traces] or [name for name, _ in BANKS[bank]]
+        return layout_panels(window, original_list, names, renderer)
+
+    algo_infos = update_algo_infos()
+
+    def restart(regenerate=True):
+        # fresh list of the current size, replays always start over from
+        # their recorded lists
+        nonlocal original_list
+        if traces:
+            restart_replays(algo_infos, traces, scheduler)
+            return
+        if regenerate:
+            original_list = starting_list()
+        restart_sorting(algo_infos, original_list, scheduler, BANKS[bank])
+
+    # start the sorting algorithms, the scheduler paces all of them
+    if processes:
+        from workers import ProcessScheduler
+        scheduler = ProcessScheduler()
+    else:
+        scheduler = Scheduler()
+    restart(regenerate=False)
+
+    # main loop
+    run = True
+    clock = pygame.time.Clock()
+    prev_list_size = n
+    redraw_all = True
+    show_stats = False
+
+    # where the frame time goes, dumped to the profile file on exit
+    profiler = FrameProfiler()
+    show_profiler = False
+
+    while run:
+        dt = clock.tick(60) / 1000
+        frame_start = time.perf_counter()
+        with profiler.time("events"):
+            events = pygame.event.get()
+
+        # update widgets
+        with profiler.time("widgets"):
+            pygame_widgets.update(events)
+
+        input_start = time.perf_counter()
+        current_list_size = int(list_size_slider.getValue())
+
+        # check if list size has changed
+        if current_list_size != prev_list_size:
+            n = current_list_size
+            restart()
+            prev_list_size = current_list_size
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                run = False
+
+            elif event.type == pygame.VIDEORESIZE:
+                # update slider position when window is resized
+                screen_width, screen_height = window.get_size()
+                list_size_slider.setX(screen_width - 300)
+                list_size_slider.setY(screen_height - 50)
+
+                # update algorithm visualizations for new window size
+                algo_infos = update_algo_infos()
+                restart(regenerate=False)
+                redraw_all = True
+
+            # add restart capability with 'R' key
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_r:
+                    seed += 1
+                    restart()
+
+                # next input distribution
+                elif event.key == pygame.K_d and not dataset:
+                    names = list(DISTRIBUTIONS)
+                    distribution = names[(names.index(distribution) + 1) % len(names)]
+                    set_caption()
+                    restart()
+
+                # change list size with arrow keys
+                elif event.key == pygame.K_UP:
+                    n = min(max_size, n + size_step)
+                    list_size_slider.setValue(n)
+                    restart()
+                    prev_list_size = n
+
+                elif event.key == pygame.K_DOWN:
+                    n = max(min_size, n - size_step)
+                    list_size_slider.setValue(n)
+                    restart()
+                    prev_list_size = n
+
+                # change speed with minus/plus keys
+                elif event.key == pygame.K_MINUS:
+                    scheduler.slower()
+
+                elif event.key in (pygame.K_EQUALS, pygame.K_PLUS):
+                    scheduler.faster()
+
+                # pause, single step and run everything to completion
+                elif event.key == pygame.K_SPACE:
+                    scheduler.toggle_pause()
+
+                elif event.key == pygame.K_s:
+                    scheduler.single_step()
+
+                elif event.key == pygame.K_f:
+                    scheduler.finish()
+
+                # scrub through the history, one simulated second per press
+                elif event.key == pygame.K_LEFT:
+                    scrub(algo_infos, scheduler, -int(scheduler.speed * Scheduler.BASE_RATE))
+
+                elif event.key == pygame.K_RIGHT:
+                    scrub(algo_infos, scheduler, int(scheduler.speed * Scheduler.BASE_RATE))
+
+                # switch between the joke sorts and the production ones
+                elif event.key == pygame.K_b and not traces:
+                    bank = (bank + 1) % len(BANKS)
+                    algo_infos = update_algo_infos()
+                    restart(regenerate=False)
+                    redraw_all = True
+
+                # operation counters on top of every panel
+                elif event.key == pygame.K_i:
+                    show_stats = not show_stats
+                    redraw_all = True
+
+                # frame time percentiles in the corner
+                elif event.key == pygame.K_p:
+                    show_profiler = not show_profiler
+                    redraw_all = True
+
+        profiler.add("input", time.perf_counter() - input_start)
+
+        # advance every algorithm by the time that passed
+        with profiler.time("sort"):
+            scheduler.tick(dt)
+
+        # draw current state
+        with profiler.time("draw"):
+            rects = draw(window, algo_infos, list_size_slider, scheduler, redraw_all, show_stats, profiler)
+        if show_profiler:
+            rects.append(draw_profiler(window, profiler))
+        with profiler.time("display"):
+            pygame.display.update(rects)
+        redraw_all = False
+
+        profiler.add("work", time.perf_counter() - frame_start)
+        profiler.end_frame(dt)
+
+    scheduler.shutdown()
+    if profile:
+        profiler.dump(profile)
+    pygame.quit()
+
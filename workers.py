@@ -0,0 +1,336 @@
+import multiprocessing
+import time
+from array import array
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithms import ALL_ALGORITHMS
+from engine import OpCounters, Scheduler, SortState
+
+# layout of the per panel control block (int64)
+VERSION = 0       # odd while the worker is publishing
+COMPLETE = 1
+LENGTH = 2        # current list length, stalin sort shrinks it
+MARK_LO = 3
+MARK_HI = 4       # -1 when nothing is marked
+HL_COUNT = 5
+ELAPSED = 6       # simulated steps used so far
+TOKEN = 7         # generation of the run that published
+COUNTERS = 8      # operation counters in OpCounters slot order
+HL_START = COUNTERS + len(OpCounters.__slots__)  # index/colour pairs follow
+HL_CAPACITY = 64
+CONTROL_SIZE = HL_START + 2 * HL_CAPACITY
+
+# layout of the settings block shared by all workers (float64)
+SPEED = 0
+PAUSED = 1
+FINISH = 2
+GENERATION = 3    # the current run, workers drop any older one
+STEP = 4          # single step requests so far
+SETTINGS_SIZE = 5
+
+BATCH = 4096  # most steps a worker applies between two publishes
+IDLE = 0.002  # seconds a worker without budget waits before looking again
+RETRIES = 3   # torn reads tolerated in one frame before keeping the old snapshot
+
+ALGORITHM_FUNCTIONS = {fn.__name__: fn for _, fn in ALL_ALGORITHMS}
+
+
+def publish(state, values, control):
+    # copy what changed in the worker's private list into shared memory, the
+    # version counter is odd for the duration so readers can tell a torn read
+    control[VERSION] += 1
+    lst = state.lst
+    if state.sortedness:
+        state.measure()
+    if state.needs_redraw:
+        values[:len(lst)] = lst
+        state.needs_redraw = False
+    else:
+        for i in state.dirty:
+            values[i] = lst[i]
+    state.dirty.clear()
+
+    control[LENGTH] = len(lst)
+    control[MARK_LO], control[MARK_HI] = state.mark_range or (0, -1)
+    count = 0
+    for i, color in state.highlights.items():
+        if count == HL_CAPACITY:
+            break
+        control[HL_START + 2 * count] = i
+        control[HL_START + 2 * count + 1] = color
+        count += 1
+    control[HL_COUNT] = count
+    control[COMPLETE] = state.sorting_complete
+    control[ELAPSED] = state.elapsed
+    control[COUNTERS:HL_START] = [getattr(state.counters, name) for name in OpCounters.__slots__]
+    control[VERSION] += 1
+
+
+def run(job, settings):
+    # one algorithm on a private list at the pace set in the settings block,
+    # given up as soon as the settings name a newer generation
+    generation, function_name, values_name, control_name, n = job
+    if settings[GENERATION] != generation:
+        return
+    values_shm = shared_memory.SharedMemory(values_name)
+    control_shm = shared_memory.SharedMemory(control_name)
+    try:
+        values = np.ndarray((n,), dtype=np.int32, buffer=values_shm.buf)
+        control = np.ndarray((CONTROL_SIZE,), dtype=np.int64, buffer=control_shm.buf)
+        control[TOKEN] = generation
+
+        state = SortState(array("i", values.tobytes()))
+        state.start(ALGORITHM_FUNCTIONS[function_name])
+        owed = 0.0
+        last = time.perf_counter()
+        seen_step = settings[STEP]
+
+        while state.steps is not None:
+            if settings[GENERATION] != generation:
+                return
+            now = time.perf_counter()
+            dt, last = now - last, now
+
+            if settings[FINISH]:
+                budget = BATCH
+            elif settings[PAUSED]:
+                budget = int(settings[STEP] - seen_step)
+                owed = 0.0
+            else:
+                owed += min(dt, 0.1) * settings[SPEED] * Scheduler.BASE_RATE
+                budget = int(owed)
+                owed -= budget
+            seen_step = settings[STEP]
+
+            if not budget:
+                time.sleep(IDLE)
+                continue
+
+            state.advance(min(budget, BATCH))
+            publish(state, values, control)
+
+        publish(state, values, control)
+    finally:
+        values = control = None
+        values_shm.close()
+        control_shm.close()
+
+
+def worker_main(jobs, settings_name):
+    # one long lived worker per panel slot, it runs every job it is sent and
+    # reports the generation back once it no longer touches the blocks, until
+    # it gets None
+    settings_shm = shared_memory.SharedMemory(settings_name)
+    settings = np.ndarray((SETTINGS_SIZE,), dtype=np.float64, buffer=settings_shm.buf)
+    try:
+        while True:
+            job = jobs.recv()
+            if job is None:
+                break
+            run(job, settings)
+            jobs.send(job[0])
+    finally:
+        del settings
+        settings_shm.close()
+
+
+class SharedPanel:
+    # shared blocks of one run of one panel, every restart gets fresh blocks
+    # so a worker still finishing an older run never writes into them. they
+    # are only unlinked once the worker reported that run done
+
+    def __init__(self, state, algorithm, generation):
+        lst = state.lst
+        n = max(1, len(lst))
+        self.values_shm = shared_memory.SharedMemory(create=True, size=n * 4)
+        self.control_shm = shared_memory.SharedMemory(create=True, size=CONTROL_SIZE * 8)
+        self.values = np.ndarray((n,), dtype=np.int32, buffer=self.values_shm.buf)
+        self.control = np.ndarray((CONTROL_SIZE,), dtype=np.int64, buffer=self.control_shm.buf)
+        self.values[:len(lst)] = lst
+        self.control[:] = 0
+        self.control[LENGTH] = len(lst)
+        self.control[MARK_HI] = -1
+        self.control[TOKEN] = generation
+
+        # the panel draws from a private snapshot that only changes between
+        # frames, never from the buffer the worker is writing to
+        self.snapshot = self.values.copy()
+        self.seen_version = 0
+        state.lst = self.snapshot[:len(lst)]
+        self.state = state
+        self.generation = generation
+        self.job = (generation, algorithm.__name__, self.values_shm.name, self.control_shm.name, n)
+
+    def read(self):
+        # copy everything published since the last snapshot, None when the
+        # worker published in the middle of it
+        control = self.control
+        version = int(control[VERSION])
+        if version == self.seen_version or version % 2 or control[TOKEN] != self.generation:
+            return None
+
+        length = int(control[LENGTH])
+        changed = np.flatnonzero(self.values[:length] != self.snapshot[:length])
+        values = self.values[changed]
+        count = int(control[HL_COUNT])
+        pairs = control[HL_START:HL_START + 2 * count].tolist()
+        mark = int(control[MARK_LO]), int(control[MARK_HI])
+        complete = bool(control[COMPLETE])
+        elapsed = int(control[ELAPSED])
+        counters = control[COUNTERS:HL_START].tolist()
+
+        if control[VERSION] != version:
+            return None
+        return version, length, changed, values, pairs, mark, complete, elapsed, counters
+
+    def sync(self):
+        for _ in range(RETRIES):
+            if self.control[VERSION] == self.seen_version:
+                return
+            published = self.read()
+            if published:
+                break
+        else:
+            return
+        version, length, changed, values, pairs, (lo, hi), complete, elapsed, counters = published
+        self.seen_version = version
+
+        # swap the new snapshot in, only the changed indices are copied
+        state = self.state
+        self.snapshot[changed] = values
+        if length != len(state.lst):
+            state.lst = self.snapshot[:length]
+            state.needs_redraw = True
+        state.dirty.update(changed.tolist())
+        state.highlights.clear()
+        for i, color in zip(pairs[::2], pairs[1::2]):
+            state.highlights.add(i, color)
+        state.mark_range = (lo, hi) if hi >= lo else None
+        state.sorting_complete = complete
+        state.elapsed = elapsed
+        for name, value in zip(OpCounters.__slots__, counters):
+            setattr(state.counters, name, value)
+
+    def close(self):
+        del self.values, self.control
+        for shm in (self.values_shm, self.control_shm):
+            shm.close()
+            shm.unlink()
+
+
+class ProcessScheduler(Scheduler):
+    # runs every algorithm in its own process, the ui only reads shared
+    # memory so sorting never competes with rendering for the gil
+
+    TIMELINES = False
+
+    def __init__(self, states=(), speed=25):
+        self.context = multiprocessing.get_context("spawn")
+        self.settings_shm = shared_memory.SharedMemory(create=True, size=SETTINGS_SIZE * 8)
+        self.settings = np.ndarray((SETTINGS_SIZE,), dtype=np.float64, buffer=self.settings_shm.buf)
+        self.settings[:] = 0
+        self.panels = []
+        self.workers = []  # (process, connection) per panel slot, kept across restarts
+        self.done = []  # last generation each worker finished with
+        self.retired = []  # (slot, panel) of older runs until their worker is done with them
+        self.generation = 0
+        super().__init__(states, speed)
+        self.publish_settings()
+
+    def publish_settings(self):
+        self.settings[SPEED] = self.speed
+        self.settings[PAUSED] = self.paused
+        self.settings[FINISH] = self.finishing
+
+    def start(self, states, algorithms):
+        # a new generation makes every worker drop its run within one batch,
+        # the new runs are queued behind it so a restart never waits on them
+        self.generation += 1
+        self.settings[GENERATION] = self.generation
+        self.retired += enumerate(self.panels)
+        self.collect()
+        self.reset(states)
+        self.publish_settings()
+        self.panels = [SharedPanel(state, algorithm, self.generation) for state, algorithm in zip(states, algorithms)]
+        while len(self.workers) < len(self.panels):
+            jobs, worker_jobs = self.context.Pipe()
+            process = self.context.Process(target=worker_main, args=(worker_jobs, self.settings_shm.name), daemon=True)
+            process.start()
+            worker_jobs.close()
+            self.workers.append((process, jobs))
+            self.done.append(0)
+        for panel, (_, jobs) in zip(self.panels, self.workers):
+            jobs.send(panel.job)
+
+    def collect(self):
+        # unlink the blocks of older runs whose worker has moved on
+        for slot, (_, jobs) in enumerate(self.workers):
+            while jobs.poll():
+                self.done[slot] = jobs.recv()
+        retired = []
+        for slot, panel in self.retired:
+            if self.done[slot] >= panel.generation:
+                panel.close()
+            else:
+                retired.append((slot, panel))
+        self.retired = retired
+
+    @property
+    def running(self):
+        return any(not panel.state.sorting_complete for panel in self.panels)
+
+    def faster(self):
+        super().faster()
+        self.publish_settings()
+
+    def slower(self):
+        super().slower()
+        self.publish_settings()
+
+    def toggle_pause(self):
+        super().toggle_pause()
+        self.publish_settings()
+
+    def single_step(self):
+        self.paused = True
+        self.publish_settings()
+        self.settings[STEP] += 1
+
+    def finish(self):
+        super().finish()
+        self.publish_settings()
+
+    def tick(self, dt):
+        # the workers keep their own pace, the ui only picks up their progress
+        for panel in self.panels:
+            panel.sync()
+        if self.retired:
+            self.collect()
+
+        if self.finishing and not self.running:
+            self.finishing = False
+            self.publish_settings()
+
+    def shutdown(self):
+        self.generation += 1
+        self.settings[GENERATION] = self.generation
+        for _, jobs in self.workers:
+            jobs.send(None)
+        for process, jobs in self.workers:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            jobs.close()
+        self.workers = []
+        for panel in self.panels:
+            panel.close()
+        for _, panel in self.retired:
+            panel.close()
+        self.panels = []
+        self.retired = []
+        del self.settings
+        self.settings_shm.close()
+        self.settings_shm.unlink()